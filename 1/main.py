@@ -1,25 +1,77 @@
 # Part One and Two
 
+import asyncio
+import mmap
+import os
+import stat
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
 
-def count_zeros_during_file(filename):
+import numpy as np
+
+# Bytes parsed at once by a worker; the array parser needs ~50x its input in memory
+SLICE_BYTES = 1024 * 1024
+
+
+def count_zero_passes(pos, direction, value, dial_size=100):
+    """
+    Computes, in constant time, how many times a single rotation makes the
+    dial point at 0 and where the dial ends up.
+
+    Rotating right by `value` clicks from `pos` visits positions pos + 1 to
+    pos + value (modulo the dial size), so the dial hits 0 once for every
+    multiple of `dial_size` in that interval: (pos + value) // dial_size.
+    Rotating left is the mirror image: measured from the opposite side, the
+    dial sits at (dial_size - pos) % dial_size and the same formula applies.
+
+    Parameters:
+        pos (int): The current position of the dial, in [0, dial_size).
+        direction (str): 'R' for a right rotation or 'L' for a left rotation.
+        value (int): The number of clicks to rotate (non-negative).
+        dial_size (int): The number of positions on the dial.
+
+    Returns:
+        tuple[int, int]: The new position of the dial and the number of times
+                         the dial pointed at 0 during the rotation.
+
+    Raises:
+        ValueError: If the direction is neither 'R' nor 'L', or the value is negative.
+    """
+    if value < 0:
+        raise ValueError(f"Negative rotation value: {value}")
+    if direction == "R":
+        return (pos + value) % dial_size, (pos + value) // dial_size
+    if direction == "L":
+        mirrored = (dial_size - pos) % dial_size  # Distance to 0 going left
+        return (pos - value) % dial_size, (mirrored + value) // dial_size
+    raise ValueError(f"Unknown direction: {direction}")
+
+
+def count_zeros_during_file(filename, dial_size=100, start=50):
     """
     Reads a file containing rotation instructions and counts how many times
     the dial points at 0 during the rotations.
 
-    The dial is assumed to have positions from 0 to 99 (total 100 positions),
-    starting at position 50.
+    The dial has positions from 0 to dial_size - 1 (100 positions by default)
+    and starts at position `start` (50 by default). Each instruction is
+    resolved in O(1) by count_zero_passes, so the runtime depends only on the
+    number of lines, not on the distance turned.
 
     Parameters:
         filename (str): The path to the input file. Each line should be a rotation
                         instruction in the format "<direction><value>", where
                         <direction> is 'R' for right or 'L' for left, and
                         <value> is the number of steps to rotate.
+        dial_size (int): The number of positions on the dial.
+        start (int): The initial position of the dial.
 
     Returns:
         int: The total number of times the dial points at 0 during all rotations.
     """
 
-    pos = 50  # Initial position of the dial
+    pos = start % dial_size  # Initial position of the dial
     zero_count = 0  # Counter for how many times the dial reaches position 0
 
     # Open the input file for reading
@@ -35,42 +87,685 @@ def count_zeros_during_file(filename):
                 value = int(
                     rotation[1:]
                 )  # Remaining characters are the number of steps
+                if value < 0:
+                    raise ValueError(f"Negative rotation value: {value}")
             except ValueError:
                 # If the line cannot be converted to an integer, skip it
                 print(f"Skipping invalid line: {rotation}")
                 continue
 
-            # Rotate to the right
-            if direction == "R":
-                for _ in range(value):
-                    pos = (
-                        pos + 1
-                    ) % 100  # Increment position and wrap around using modulo 100
-                    if pos == 0:
-                        zero_count += (
-                            1  # Increment zero counter whenever position reaches 0
-                        )
-
-            # Rotate to the left
-            elif direction == "L":
-                for _ in range(value):
-                    pos = (
-                        pos - 1
-                    ) % 100  # Decrement position and wrap around using modulo 100
-                    if pos == 0:
-                        zero_count += (
-                            1  # Increment zero counter whenever position reaches 0
-                        )
-
             # If the direction is not recognized, skip the line
-            else:
+            if direction not in ("R", "L"):
                 print(f"Skipping unknown direction: {rotation}")
                 continue
 
+            # Rotate in one arithmetic step and accumulate the zeros passed
+            pos, hits = count_zero_passes(pos, direction, value, dial_size)
+            zero_count += hits
+
     return zero_count  # Return the total count of zeros encountered
 
 
+def load_rotations_array(filename):
+    """
+    Parses a whole rotation file into a signed int64 array in one bulk read.
+
+    The file is read once as raw bytes and decoded with array operations only:
+    digits are weighted by their power of ten within their line and summed per
+    line, and the leading 'R'/'L' gives the sign. Lines are stripped and
+    validated like count_zeros_during_file does: blank lines and lines that
+    are not of the form "<direction><value>" are dropped.
+
+    Parameters:
+        filename (str): The path to the rotation file.
+
+    Returns:
+        numpy.ndarray: One signed step per valid instruction, positive for a
+                       right rotation and negative for a left rotation.
+    """
+    with open(filename, "rb") as file:
+        return parse_rotations(file.read())
+
+
+def parse_rotations(raw):
+    """
+    Decodes a block of rotation instructions into signed int64 steps.
+
+    This is the array-only parser behind load_rotations_array; it works on any
+    bytes-like object, such as a slice of a memory-mapped file.
+
+    Parameters:
+        raw (bytes): Rotation instructions, one per line. Read in place, without copying.
+
+    Returns:
+        numpy.ndarray: One signed step per valid instruction.
+
+    Raises:
+        ValueError: If a valid instruction has more than 18 digits.
+    """
+    buf = np.frombuffer(raw, dtype=np.uint8)
+    if len(buf) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    # Lone '\r' ends a line too, as with the universal newlines of text mode
+    is_newline = (buf == ord("\n")) | (buf == ord("\r"))
+    newlines = np.flatnonzero(is_newline)
+    if not is_newline[-1]:
+        # The last line has no newline: end it just past the buffer
+        newlines = np.append(newlines, len(buf))
+    n_lines = len(newlines)
+
+    # Index of the line every byte belongs to (its newline included)
+    line_id = np.cumsum(is_newline) - is_newline
+
+    # The same whitespace as str.strip(), which the line-by-line reader applies
+    is_space = ((buf == ord(" ")) | ((buf >= ord("\t")) & (buf <= ord("\r")))) & ~is_newline
+    is_digit = (buf >= ord("0")) & (buf <= ord("9"))
+    is_text = ~(is_space | is_newline)
+
+    # The direction is the first non-space byte of its line
+    text_pos = np.flatnonzero(is_text)
+    text_line = line_id[text_pos]
+    is_first = np.diff(text_line, prepend=-1) != 0
+    head = np.zeros(n_lines, dtype=np.uint8)
+    head[text_line[is_first]] = buf[text_pos[is_first]]
+    blank = np.bincount(text_line, minlength=n_lines) == 0
+
+    # A line is valid if its direction is followed by one run of digits and
+    # nothing else but spaces, like int() accepts for rotation[1:]
+    digit_pos = np.flatnonzero(is_digit)
+    digit_line = line_id[digit_pos]
+    digit_count = np.bincount(digit_line, minlength=n_lines)
+    text_count = np.bincount(text_line, minlength=n_lines)
+    first_digit = np.cumsum(digit_count) - digit_count
+    has_digits = digit_count > 0
+    span = np.zeros(n_lines, dtype=np.int64)
+    if len(digit_pos):
+        last_digit = first_digit + digit_count - 1
+        span[has_digits] = digit_pos[last_digit[has_digits]] - digit_pos[first_digit[has_digits]] + 1
+    is_direction = (head == ord("R")) | (head == ord("L"))
+    valid = is_direction & has_digits & (text_count == digit_count + 1) & (span == digit_count)
+
+    invalid = n_lines - int(valid.sum()) - int(blank.sum())
+    if invalid:
+        print(f"Skipping {invalid} invalid line(s)")
+    if (digit_count[valid] > 18).any():
+        raise ValueError("Rotation values above 18 digits do not fit in int64, use count_zeros_during_file")
+
+    # Weight every digit by 10 ** (number of digits after it on its line)
+    rank = np.arange(len(digit_pos)) - first_digit[digit_line]
+    exponent = np.minimum(digit_count[digit_line] - 1 - rank, 18)
+    terms = (buf[digit_pos].astype(np.int64) - ord("0")) * 10 ** exponent.astype(np.int64)
+
+    values = np.zeros(n_lines, dtype=np.int64)
+    if len(terms):
+        values[has_digits] = np.add.reduceat(terms, first_digit[has_digits])
+
+    steps = np.where(head == ord("R"), values, -values)
+    return steps[valid]
+
+
+def count_zeros_batch(filename, dial_size=100, start=50):
+    """
+    Counts, in a single vectorized pass, how many rotations end on 0 and how
+    many times the dial points at 0 during the rotations.
+
+    The instructions are loaded with load_rotations_array, the dial position
+    after every instruction comes from a cumulative sum, and the zero hits of
+    every instruction are counted with the same floor-division formula as
+    count_zero_passes, applied to whole arrays at once.
+
+    Parameters:
+        filename (str): The path to the rotation file.
+        dial_size (int): The number of positions on the dial.
+        start (int): The initial position of the dial.
+
+    Returns:
+        tuple[int, int]: The number of rotations that end on 0 (Part One) and
+                         the number of times the dial points at 0 (Part Two).
+    """
+    steps = load_rotations_array(filename)
+    if len(steps) == 0:
+        return 0, 0
+
+    # Accumulate reduced steps so that long logs of large values cannot overflow
+    positions = (start + np.cumsum(steps % dial_size)) % dial_size
+    previous = np.concatenate(([start % dial_size], positions[:-1]))
+
+    distance = np.abs(steps)
+    # Distance from the previous position to 0 in the direction of travel
+    offset = np.where(steps >= 0, previous, (dial_size - previous) % dial_size)
+    passes = (offset + distance) // dial_size
+
+    return int(np.count_nonzero(positions == 0)), int(passes.sum())
+
+
+def summarize_steps(steps, dial_size=100):
+    """
+    Builds the associative summary of a sequence of signed rotation steps.
+
+    The summary is the net offset of the sequence together with, for every
+    possible entry position p, the number of times the dial points at 0 while
+    the sequence is applied starting from p. Each step of distance d hits 0
+    d // dial_size times for sure, plus once more when its starting position
+    lies in a cyclic arc of length d % dial_size; those arcs are accumulated
+    with a difference array, so the cost is O(len(steps) + dial_size).
+
+    Parameters:
+        steps (numpy.ndarray): Signed steps as returned by parse_rotations.
+        dial_size (int): The number of positions on the dial.
+
+    Returns:
+        tuple[int, numpy.ndarray]: The net offset modulo dial_size and an
+                                   int64 array of zero counts per entry position.
+    """
+    counts = np.zeros(dial_size, dtype=np.int64)
+    if len(steps) == 0:
+        return 0, counts
+
+    distance = np.abs(steps)
+    counts += int((distance // dial_size).sum())
+
+    # Offset of the dial from the entry position before each step
+    before = np.concatenate(([0], np.cumsum(steps % dial_size)[:-1])) % dial_size
+    remainder = distance % dial_size
+
+    # Right: extra hit when the start is in [n - r, n); left: when it is in [1, r]
+    arc_start = np.where(steps >= 0, dial_size - remainder, 1)
+    first = (arc_start - before) % dial_size
+    partial = remainder > 0
+    first, length = first[partial], remainder[partial]
+
+    diff = np.zeros(dial_size + 1, dtype=np.int64)
+    last = first + length
+    wraps = last > dial_size
+    np.add.at(diff, first, 1)
+    np.add.at(diff, np.minimum(last, dial_size), -1)
+    # Arcs running past the end of the dial continue from position 0
+    diff[0] += int(wraps.sum())
+    np.add.at(diff, last[wraps] - dial_size, -1)
+    counts += np.cumsum(diff[:-1])
+
+    return int((steps % dial_size).sum() % dial_size), counts
+
+
+def combine_summaries(first, second, dial_size=100):
+    """
+    Combines the summaries of two consecutive blocks of instructions.
+
+    Entering the first block at p leaves the dial at p + offset, which is the
+    entry position of the second block. The operation is associative, so the
+    summaries of any number of consecutive chunks can be folded in order.
+
+    Parameters:
+        first (tuple[int, numpy.ndarray]): Summary of the earlier block.
+        second (tuple[int, numpy.ndarray]): Summary of the later block.
+        dial_size (int): The number of positions on the dial.
+
+    Returns:
+        tuple[int, numpy.ndarray]: The summary of both blocks run back to back.
+    """
+    offset_a, counts_a = first
+    offset_b, counts_b = second
+    entry = np.arange(dial_size)
+    return (
+        (offset_a + offset_b) % dial_size,
+        counts_a + counts_b[(entry + offset_a) % dial_size],
+    )
+
+
+def split_into_chunks(filename, chunk_count):
+    """
+    Splits a file into byte ranges that start and end on line boundaries.
+
+    Parameters:
+        filename (str): The path to the rotation file.
+        chunk_count (int): The desired number of chunks.
+
+    Returns:
+        list[tuple[int, int]]: Non-empty (start, end) byte offsets covering the file.
+    """
+    size = os.path.getsize(filename)
+    if size == 0:
+        return []
+
+    with open(filename, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        bounds = [0]
+        for i in range(1, chunk_count):
+            # Move each nominal boundary to just after the next newline
+            cut = data.find(b"\n", max(size * i // chunk_count, bounds[-1]))
+            if cut == -1:
+                break
+            bounds.append(cut + 1)
+        bounds.append(size)
+
+    return [(lo, hi) for lo, hi in zip(bounds, bounds[1:]) if hi > lo]
+
+
+def line_slices(data, lo, hi, max_bytes):
+    """
+    Splits the byte range [lo, hi) of a buffer into slices of at most
+    max_bytes that end on line boundaries (a longer line gets its own slice).
+
+    Parameters:
+        data (mmap.mmap): The buffer holding the rotation file.
+        lo (int): Start offset of the range.
+        hi (int): End offset of the range.
+        max_bytes (int): The maximum size of a slice.
+
+    Returns:
+        list[tuple[int, int]]: Non-empty (start, end) byte offsets covering the range.
+    """
+    slices = []
+    while lo < hi:
+        end = hi
+        if hi - lo > max_bytes:
+            cut = data.rfind(b"\n", lo, lo + max_bytes)
+            if cut == -1:
+                cut = data.find(b"\n", lo + max_bytes, hi)
+            if cut != -1:
+                end = cut + 1
+        slices.append((lo, end))
+        lo = end
+    return slices
+
+
+def summarize_chunk(task):
+    """
+    Worker entry point: memory-maps the file and summarizes one byte range.
+
+    The range is parsed in slices of at most SLICE_BYTES read in place from
+    the mapping, whose summaries are folded in order, so the memory used by a
+    worker does not grow with the size of its chunk.
+
+    Parameters:
+        task (tuple[str, int, int, int]): File name, start offset, end offset
+                                          and dial size.
+
+    Returns:
+        tuple[int, numpy.ndarray]: The summary of the chunk.
+    """
+    filename, lo, hi, dial_size = task
+    summary = (0, np.zeros(dial_size, dtype=np.int64))
+    with open(filename, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        for start, end in line_slices(data, lo, hi, SLICE_BYTES):
+            view = np.frombuffer(data, dtype=np.uint8, count=end - start, offset=start)
+            steps = parse_rotations(view)
+            # Release the view before the mapping is closed
+            del view
+            summary = combine_summaries(summary, summarize_steps(steps, dial_size), dial_size)
+    return summary
+
+
+def count_zeros_parallel(filename, dial_size=100, start=50, workers=None, chunks=None):
+    """
+    Counts how many times the dial points at 0 by summarizing byte-range
+    chunks of the file in worker processes and folding the summaries in order.
+
+    Parameters:
+        filename (str): The path to the rotation file.
+        dial_size (int): The number of positions on the dial.
+        start (int): The initial position of the dial.
+        workers (int | None): The number of worker processes (all cores by default).
+        chunks (int | None): The number of chunks (4 per worker by default).
+
+    Returns:
+        int: The total number of times the dial points at 0 during all rotations.
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = split_into_chunks(filename, chunks or 4 * workers)
+    tasks = [(filename, lo, hi, dial_size) for lo, hi in ranges]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        summaries = list(pool.map(summarize_chunk, tasks))
+
+    identity = (0, np.zeros(dial_size, dtype=np.int64))
+    _, counts = reduce(
+        lambda a, b: combine_summaries(a, b, dial_size), summaries, identity
+    )
+    return int(counts[start % dial_size])
+
+
+class RotationIndex:
+    """
+    Segment tree over a parsed rotation log answering "where is the dial and
+    how many times did it point at 0 after the first k instructions" and
+    supporting the replacement of a single instruction, both in O(log n).
+
+    Instructions are grouped into fixed-size blocks; every tree node stores
+    the associative summary (see summarize_steps) of the blocks it covers.
+    A prefix query folds O(log n) node summaries starting from the start
+    position and finishes inside one block; an edit re-summarizes one block
+    and the nodes above it. The index can be saved to and loaded from disk.
+    """
+
+    def __init__(self, steps, offsets, counts, dial_size, start, block_size):
+        self.steps = steps
+        self.offsets = offsets
+        self.counts = counts
+        self.dial_size = dial_size
+        self.start = start % dial_size
+        self.block_size = block_size
+        self.leaves = len(offsets) // 2
+
+    @classmethod
+    def build(cls, steps, dial_size=100, start=50, block_size=64):
+        """
+        Builds the index from signed steps (see parse_rotations).
+
+        Parameters:
+            steps (numpy.ndarray): Signed rotation steps.
+            dial_size (int): The number of positions on the dial.
+            start (int): The initial position of the dial.
+            block_size (int): The number of instructions per leaf.
+
+        Returns:
+            RotationIndex: The index over the given steps.
+        """
+        steps = np.array(steps, dtype=np.int64)
+        blocks = max(1, -(-len(steps) // block_size))
+        leaves = 1 << (blocks - 1).bit_length()
+
+        offsets = np.zeros(2 * leaves, dtype=np.int64)
+        counts = np.zeros((2 * leaves, dial_size), dtype=np.int64)
+        for b in range(blocks):
+            chunk = steps[b * block_size : (b + 1) * block_size]
+            offsets[leaves + b], counts[leaves + b] = summarize_steps(chunk, dial_size)
+
+        index = cls(steps, offsets, counts, dial_size, start, block_size)
+        # Combine whole tree levels at once, from the leaves up to the root
+        level = leaves // 2
+        while level:
+            nodes = np.arange(level, 2 * level)
+            index._pull(nodes)
+            level //= 2
+        return index
+
+    @classmethod
+    def from_file(cls, filename, dial_size=100, start=50, block_size=64):
+        """Builds the index from a rotation file (see load_rotations_array)."""
+        return cls.build(load_rotations_array(filename), dial_size, start, block_size)
+
+    def _pull(self, nodes):
+        """Recomputes the summaries of the given nodes from their children."""
+        left, right = 2 * nodes, 2 * nodes + 1
+        shifted = (np.arange(self.dial_size) + self.offsets[left][:, None]) % self.dial_size
+        self.offsets[nodes] = (self.offsets[left] + self.offsets[right]) % self.dial_size
+        self.counts[nodes] = self.counts[left] + np.take_along_axis(
+            self.counts[right], shifted, axis=1
+        )
+
+    def __len__(self):
+        return len(self.steps)
+
+    def query(self, k):
+        """
+        Returns the dial state after the first k instructions.
+
+        Parameters:
+            k (int): The number of instructions applied, from 0 to len(self).
+
+        Returns:
+            tuple[int, int]: The position of the dial and the number of times
+                             it has pointed at 0 so far.
+
+        Raises:
+            IndexError: If k is outside [0, len(self)].
+        """
+        if not 0 <= k <= len(self.steps):
+            raise IndexError(f"Instruction count out of range: {k}")
+
+        pos, zero_count = self.start, 0
+        full_blocks = k // self.block_size
+
+        # Fold the whole blocks [0, full_blocks) from the root down
+        node, lo, hi = 1, 0, self.leaves
+        while full_blocks > lo:
+            if full_blocks >= hi:
+                zero_count += int(self.counts[node][pos])
+                pos = (pos + int(self.offsets[node])) % self.dial_size
+                break
+            mid = (lo + hi) // 2
+            if full_blocks > mid:
+                # The left child is entirely inside the prefix
+                zero_count += int(self.counts[2 * node][pos])
+                pos = (pos + int(self.offsets[2 * node])) % self.dial_size
+                node, lo = 2 * node + 1, mid
+            else:
+                node, hi = 2 * node, mid
+
+        # Finish inside the partial block one instruction at a time
+        for step in self.steps[full_blocks * self.block_size : k]:
+            direction = "R" if step >= 0 else "L"
+            pos, hits = count_zero_passes(pos, direction, abs(int(step)), self.dial_size)
+            zero_count += hits
+
+        return pos, zero_count
+
+    def replace(self, i, direction, value):
+        """
+        Replaces instruction i and updates the summaries above it.
+
+        Parameters:
+            i (int): The index of the instruction to replace.
+            direction (str): 'R' for a right rotation or 'L' for a left rotation.
+            value (int): The number of clicks to rotate.
+
+        Raises:
+            IndexError: If i is not the index of an instruction.
+            ValueError: If the direction is neither 'R' nor 'L', or the value is negative.
+        """
+        if not 0 <= i < len(self.steps):
+            raise IndexError(f"Instruction index out of range: {i}")
+        if direction not in ("R", "L"):
+            raise ValueError(f"Unknown direction: {direction}")
+        if value < 0:
+            raise ValueError(f"Negative rotation value: {value}")
+
+        self.steps[i] = value if direction == "R" else -value
+        block = i // self.block_size
+        chunk = self.steps[block * self.block_size : (block + 1) * self.block_size]
+        node = self.leaves + block
+        self.offsets[node], self.counts[node] = summarize_steps(chunk, self.dial_size)
+
+        node //= 2
+        while node:
+            self._pull(np.array([node]))
+            node //= 2
+
+    def save(self, path):
+        """Writes the index to `path` as an uncompressed NumPy archive."""
+        with open(path, "wb") as file:
+            np.savez(
+                file,
+                steps=self.steps,
+                offsets=self.offsets,
+                counts=self.counts,
+                meta=np.array([self.dial_size, self.start, self.block_size]),
+            )
+
+    @classmethod
+    def load(cls, path):
+        """Reads an index previously written by save."""
+        with np.load(path) as data:
+            dial_size, start, block_size = (int(x) for x in data["meta"])
+            return cls(
+                data["steps"].copy(),
+                data["offsets"].copy(),
+                data["counts"].copy(),
+                dial_size,
+                start,
+                block_size,
+            )
+
+
+class FileTail:
+    """
+    Line reader over a regular file, used where asyncio pipe transports do not
+    apply. With follow=True it behaves like `tail -f`: at the end of the file
+    it waits for more lines to be appended instead of ending the stream.
+
+    The file is read in blocks on the default executor, so a slow disk never
+    blocks the event loop.
+    """
+
+    def __init__(self, file, follow=True, poll=0.2, block_size=64 * 1024):
+        self.file = file
+        self.follow = follow
+        self.poll = poll
+        self.block_size = block_size
+        self.buffer = b""
+        self.offset = 0  # Start of the unread part of the buffer
+
+    async def readline(self):
+        """Returns the next complete line, or b"" at the end of a non-followed file."""
+        loop = asyncio.get_running_loop()
+        while True:
+            end = self.buffer.find(b"\n", self.offset) + 1
+            if end:
+                line, self.offset = self.buffer[self.offset : end], end
+                return line
+
+            block = await loop.run_in_executor(None, self.file.read, self.block_size)
+            if block:
+                # Keep any partial line in front of the new block
+                self.buffer, self.offset = self.buffer[self.offset :] + block, 0
+            elif not self.follow:
+                line, self.buffer, self.offset = self.buffer[self.offset :], b"", 0
+                return line
+            else:
+                await asyncio.sleep(self.poll)
+
+    def close(self):
+        self.file.close()
+
+
+async def open_rotation_stream(source="-"):
+    """
+    Opens an asyncio stream reader over a live source of rotation instructions.
+
+    Parameters:
+        source (str): "-" for stdin, a path to a named pipe or to a growing
+                      file (followed until interrupted), or "unix:<path>" /
+                      "tcp:<host>:<port>" for a local socket. A regular file
+                      redirected to stdin is read to its end.
+
+    Returns:
+        tuple[asyncio.StreamReader | FileTail, callable]: A reader delivering
+            the instructions as they arrive, and a function releasing the source.
+    """
+    if source.startswith("unix:"):
+        reader, writer = await asyncio.open_unix_connection(source[len("unix:") :])
+        return reader, writer.close
+    if source.startswith("tcp:"):
+        host, port = source[len("tcp:") :].rsplit(":", 1)
+        reader, writer = await asyncio.open_connection(host, int(port))
+        return reader, writer.close
+
+    pipe = sys.stdin.buffer if source == "-" else open(source, "rb")
+    if stat.S_ISREG(os.fstat(pipe.fileno()).st_mode):
+        tail = FileTail(pipe, follow=source != "-")
+        # Leave stdin open for the caller
+        return tail, (lambda: None) if source == "-" else tail.close
+
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    transport, _ = await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), pipe
+    )
+    return reader, (lambda: None) if source == "-" else transport.close
+
+
+async def stream_zeros(reader, dial_size=100, start=50, interval=1.0, on_snapshot=print):
+    """
+    Consumes rotation instructions from a stream as they arrive, keeping a
+    running dial position and zero count.
+
+    Every line is read exactly once and resolved with count_zero_passes, so
+    the state never has to be rebuilt from the start of the log. A snapshot
+    is emitted every `interval` seconds, also while the source is idle, and a
+    final one when the stream ends.
+
+    Parameters:
+        reader (asyncio.StreamReader | FileTail): The source of instructions.
+        dial_size (int): The number of positions on the dial.
+        start (int): The initial position of the dial.
+        interval (float): The number of seconds between snapshots.
+        on_snapshot (callable): Called with a dict holding the number of
+                                instructions processed, the position and the
+                                zero count.
+
+    Returns:
+        int: The total number of times the dial pointed at 0.
+    """
+    pos = start % dial_size
+    zero_count = 0
+    processed = 0
+    next_snapshot = time.monotonic() + interval
+
+    def snapshot():
+        nonlocal next_snapshot
+        on_snapshot({"instructions": processed, "position": pos, "zeros": zero_count})
+        next_snapshot = time.monotonic() + interval
+
+    async def ticker():
+        # Covers idle sources; busy ones are checked after every line below,
+        # since readline does not yield to the event loop when data is buffered
+        while True:
+            await asyncio.sleep(max(0.0, next_snapshot - time.monotonic()))
+            if time.monotonic() >= next_snapshot:
+                snapshot()
+
+    timer = asyncio.ensure_future(ticker())
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break  # End of stream
+
+            rotation = line.decode().strip()
+            if not rotation:
+                continue
+            try:
+                value = int(rotation[1:])
+                pos, hits = count_zero_passes(pos, rotation[0], value, dial_size)
+            except ValueError:
+                print(f"Skipping invalid line: {rotation}")
+                continue
+
+            zero_count += hits
+            processed += 1
+
+            if time.monotonic() >= next_snapshot:
+                snapshot()
+    finally:
+        timer.cancel()
+
+    snapshot()
+    return zero_count
+
+
+async def monitor_rotations(source="-", dial_size=100, start=50, interval=1.0):
+    """Streams instructions from `source` (see open_rotation_stream) and prints snapshots."""
+    reader, close = await open_rotation_stream(source)
+    try:
+        return await stream_zeros(reader, dial_size, start, interval)
+    finally:
+        close()
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--stream":
+        # Live mode: python main.py --stream [source] [interval]
+        source = sys.argv[2] if len(sys.argv) > 2 else "-"
+        interval = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0
+        asyncio.run(monitor_rotations(source, interval=interval))
+        sys.exit(0)
+
     filename = (
         "rotations.txt"  # Path to the input file containing rotation instructions
     )
@@ -1,11 +1,64 @@
+import json
 import os
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+import numpy as np
 
 # Determine the absolute directory of the current script
 actual_dir = os.path.dirname(os.path.abspath(__file__))
 
-# Record the total start time for performance measurement
-start_total = time.time()
+# Directory holding the prebuilt repeated-pattern indexes
+index_dir = os.path.join(actual_dir, "index")
+
+# Bumped whenever the on-disk layout of an index changes
+INDEX_FORMAT_VERSION = 1
+
+# Indexes already loaded in this process, keyed by (digits, mode)
+_pattern_indexes = {}
+
+
+@lru_cache(maxsize=None)
+def pattern_multipliers(length: int) -> tuple:
+    """
+    Returns the repunit-style multipliers of every chunk size for a digit length.
+
+    A number of `length` digits is a k-digit chunk repeated length // k times
+    iff it is divisible by (10**length - 1) // (10**k - 1), e.g. 1001001 for
+    three 3-digit chunks or 1111 for four 1-digit chunks.
+
+    Parameters:
+        length (int): Number of digits.
+
+    Returns:
+        tuple[int, ...]: One multiplier per chunk size k dividing length, k < length.
+    """
+    return tuple(
+        (10**length - 1) // (10**k - 1)
+        for k in range(1, length // 2 + 1)
+        if length % k == 0
+    )
+
+
+def digit_length(n: int) -> int:
+    """
+    Returns the number of decimal digits of a non-negative integer without
+    converting it to a string.
+
+    Parameters:
+        n (int): The number to measure.
+
+    Returns:
+        int: The number of digits of n (1 for 0).
+    """
+    length = max(1, (n.bit_length() * 30103) // 100000)  # log10(2) ~ 0.30103
+    while 10**length <= n:
+        length += 1
+    while length > 1 and 10 ** (length - 1) > n:
+        length -= 1
+    return length
 
 
 def is_repeated_pattern(n: int) -> bool:
@@ -20,80 +73,460 @@ def is_repeated_pattern(n: int) -> bool:
         123123123 -> True  (pattern "123" repeated)
         1234 -> False (no repeated pattern)
 
+    The check is purely arithmetic: n has a repeated pattern iff it is
+    divisible by one of the multipliers of its digit length.
+
     Parameters:
         n (int): The number to check for repeated digit patterns.
 
     Returns:
         bool: True if n has a repeated pattern, False otherwise.
     """
-    s = str(n)  # Convert the number to a string for pattern checking
-    L = len(s)  # Length of the number in digits
+    # Try every chunk size dividing the number length evenly
+    return any(n % m == 0 for m in pattern_multipliers(digit_length(n)))
 
-    # Try all possible chunk sizes from 1 up to half the number length
-    for k in range(1, L // 2 + 1):
-        if L % k == 0:  # Only consider chunk sizes that divide the number length evenly
-            chunk = s[:k]  # Take the first chunk
-            if s == chunk * (
-                L // k
-            ):  # Check if repeating the chunk reconstructs the number
-                return True
 
-    # If no repeated pattern is found, return False
-    return False
+# int64 holds every number of up to 19 digits needed by the batch predicate
+POWERS_OF_TEN = np.array([10**i for i in range(19)], dtype=np.int64)
 
 
-def sum_invalid_ids_from_file(path: str) -> int:
+def is_repeated_pattern_batch(values: np.ndarray) -> np.ndarray:
     """
-    Reads ranges of numbers from a file and sums all numbers that contain repeated patterns.
+    Vectorized form of is_repeated_pattern over a whole int64 block.
 
-    The input file is expected to contain a single line with comma-separated ranges,
-    each in the format "low-high". For example:
-        10-20,100-120,200-202
+    The digit length of every value comes from one binary search in the
+    powers of ten; each value is then tested against the multipliers of its
+    length with array-wide modulo operations.
+
+    Parameters:
+        values (numpy.ndarray): Non-negative integers of up to 19 digits.
+
+    Returns:
+        numpy.ndarray: Boolean mask, True where the value has a repeated pattern.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    lengths = np.searchsorted(POWERS_OF_TEN, values, side="right")
+    result = np.zeros(values.shape, dtype=bool)
+
+    for length in np.unique(lengths):
+        same = lengths == length
+        block = values[same]
+        hits = np.zeros(block.shape, dtype=bool)
+        for m in pattern_multipliers(int(length)):
+            hits |= block % m == 0
+        result[same] = hits
+
+    return result
+
+
+def sum_repeated_patterns_bruteforce(low: int, high: int, block_size: int = 1 << 20) -> tuple:
+    """
+    Counts and sums the repeated-pattern numbers in [low, high] by testing
+    every integer, one NumPy block at a time. Meant to validate the faster
+    generators on huge ranges.
+
+    Parameters:
+        low (int): Lower bound of the range (inclusive).
+        high (int): Upper bound of the range (inclusive).
+        block_size (int): Number of candidates classified per block.
+
+    Returns:
+        tuple[int, int]: The count and the sum of the matching numbers.
+    """
+    count, total = 0, 0
+    for start in range(low, high + 1, block_size):
+        block = np.arange(start, min(start + block_size, high + 1), dtype=np.int64)
+        matches = block[is_repeated_pattern_batch(block)]
+        count += len(matches)
+        total += sum(int(x) for x in matches)
+    return count, total
+
+
+def sum_chunk_repetitions(low: int, high: int, length: int, k: int) -> tuple:
+    """
+    Counts and sums the numbers of exactly `length` digits in [low, high]
+    that are a k-digit chunk repeated length // k times.
+
+    Such a number is chunk * M with M = (10**length - 1) // (10**k - 1)
+    (e.g. 1001001 for three 3-digit chunks), so the valid chunks form a
+    contiguous interval and their sum is an arithmetic series.
+
+    Parameters:
+        low (int): Lower bound of the range (inclusive).
+        high (int): Upper bound of the range (inclusive).
+        length (int): Number of digits of the generated numbers.
+        k (int): Chunk size in digits; must divide length.
+
+    Returns:
+        tuple[int, int]: The count and the sum of the matching numbers.
+    """
+    multiplier = (10**length - 1) // (10**k - 1)
+    lo = max(low, 10 ** (length - 1))
+    hi = min(high, 10**length - 1)
+
+    # Smallest and largest chunk whose repetition falls inside [lo, hi]
+    first = max(-(-lo // multiplier), 10 ** (k - 1))
+    last = min(hi // multiplier, 10**k - 1)
+    if first > last:
+        return 0, 0
+
+    count = last - first + 1
+    return count, multiplier * (first + last) * count // 2
+
+
+def count_and_sum_repeated_patterns(low: int, high: int) -> tuple:
+    """
+    Counts and sums the numbers in [low, high] that have a repeated pattern
+    without testing every integer of the range.
+
+    For every digit length, the numbers generated by each chunk size k are
+    summed with sum_chunk_repetitions. A number such as 111111 is generated
+    by several chunk sizes (1, 2 and 3), so the families are deduplicated by
+    their minimal period: the numbers whose shortest repeating chunk has size
+    k are those generated by k minus those already counted for the proper
+    divisors of k. The cost depends on the number of digit lengths and chunk
+    sizes, not on the width of the range.
+
+    Parameters:
+        low (int): Lower bound of the range (inclusive).
+        high (int): Upper bound of the range (inclusive).
+
+    Returns:
+        tuple[int, int]: The count and the sum of the repeated-pattern numbers.
+    """
+    count, total = 0, 0
+
+    for length in range(max(len(str(max(low, 1))), 2), len(str(high)) + 1):
+        periods = [k for k in range(1, length // 2 + 1) if length % k == 0]
+        exact = {}  # Count and sum of numbers whose minimal period is k
+
+        for k in periods:
+            k_count, k_total = sum_chunk_repetitions(low, high, length, k)
+            for p in periods:
+                if p < k and k % p == 0:
+                    k_count -= exact[p][0]
+                    k_total -= exact[p][1]
+            exact[k] = (k_count, k_total)
+            count += k_count
+            total += k_total
+
+    return count, total
+
+
+def generate_repeated_patterns(digits: int, mode: str = "any") -> np.ndarray:
+    """
+    Generates, in increasing order, every repeated-pattern number with at
+    most `digits` digits.
+
+    Parameters:
+        digits (int): Maximum number of digits of the generated numbers.
+        mode (str): "any" for a chunk repeated at least twice, "twice" for a
+                    chunk repeated exactly twice.
+
+    Returns:
+        numpy.ndarray: Sorted, duplicate-free int64 array of the numbers.
+
+    Raises:
+        ValueError: If the mode is unknown.
+    """
+    if mode not in ("any", "twice"):
+        raise ValueError(f"Unknown pattern mode: {mode}")
+
+    families = []
+    for length in range(2, digits + 1):
+        if mode == "twice":
+            sizes = [length // 2] if length % 2 == 0 else []
+        else:
+            sizes = [k for k in range(1, length // 2 + 1) if length % k == 0]
+        for k in sizes:
+            multiplier = (10**length - 1) // (10**k - 1)
+            chunks = np.arange(10 ** (k - 1), 10**k, dtype=np.int64)
+            families.append(chunks * multiplier)
+
+    if not families:
+        return np.zeros(0, dtype=np.int64)
+    return np.unique(np.concatenate(families))  # Sorts and drops 111111-style overlaps
+
+
+def index_path(digits: int, mode: str = "any") -> str:
+    """
+    Returns the file path of the index for a digit bound and pattern mode.
+
+    Parameters:
+        digits (int): Maximum number of digits covered by the index.
+        mode (str): Pattern mode, "any" or "twice".
+
+    Returns:
+        str: Path of the .npy file, versioned by format, mode and digit bound.
+    """
+    name = f"repeated_v{INDEX_FORMAT_VERSION}_{mode}_{digits}.npy"
+    return os.path.join(index_dir, name)
+
+
+def build_pattern_index(digits: int, mode: str = "any") -> str:
+    """
+    Builds the sorted table of repeated-pattern numbers with its prefix sums
+    and writes it to disk as a memory-mappable .npy file.
+
+    The table has two int64 columns: the numbers in increasing order and the
+    running sum of the numbers up to and including each row.
+
+    Parameters:
+        digits (int): Maximum number of digits covered by the index.
+        mode (str): Pattern mode, "any" or "twice".
 
-    For each range, all numbers are tested using is_repeated_pattern. The sum of
-    numbers with repeated patterns is accumulated and returned.
+    Returns:
+        str: The path of the written index.
+
+    Raises:
+        ValueError: If the prefix sums do not fit in int64 for this bound.
+    """
+    values = generate_repeated_patterns(digits, mode)
+    if values.sum(dtype=np.float64) >= 2**63:
+        raise ValueError(f"Prefix sums overflow int64 for {digits} digits")
+
+    table = np.empty((len(values), 2), dtype=np.int64)
+    table[:, 0] = values
+    table[:, 1] = np.cumsum(values)
+
+    os.makedirs(index_dir, exist_ok=True)
+    path = index_path(digits, mode)
+    # Write to a per-process temporary file first so that concurrent builders
+    # never read each other's half-written index
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, table)
+    os.replace(tmp_path, path)
+    return path
 
-    Performance is measured per range and for the total computation.
+
+def load_pattern_index(digits: int = 12, mode: str = "any") -> np.ndarray:
+    """
+    Returns the index for a digit bound and pattern mode, memory-mapping it
+    on first use and building it if it does not exist yet.
+
+    Parameters:
+        digits (int): Maximum number of digits covered by the index.
+        mode (str): Pattern mode, "any" or "twice".
+
+    Returns:
+        numpy.ndarray: The read-only (n, 2) table of numbers and prefix sums.
+    """
+    key = (digits, mode)
+    if key not in _pattern_indexes:
+        path = index_path(digits, mode)
+        if not os.path.exists(path):
+            build_pattern_index(digits, mode)
+        _pattern_indexes[key] = np.load(path, mmap_mode="r")
+    return _pattern_indexes[key]
+
+
+def sum_repeated_patterns_indexed(low: int, high: int, digits: int = 12, mode: str = "any") -> tuple:
+    """
+    Counts and sums the repeated-pattern numbers in [low, high] with two
+    binary searches in the prebuilt index and one subtraction.
+
+    Parameters:
+        low (int): Lower bound of the range (inclusive).
+        high (int): Upper bound of the range (inclusive).
+        digits (int): Digit bound of the index to use.
+        mode (str): Pattern mode, "any" or "twice".
+
+    Returns:
+        tuple[int, int]: The count and the sum of the matching numbers.
+
+    Raises:
+        ValueError: If the range exceeds the digit bound of the index.
+    """
+    if high >= 10**digits:
+        raise ValueError(f"Range {low}-{high} exceeds the {digits}-digit index")
+
+    table = load_pattern_index(digits, mode)
+    values, prefix = table[:, 0], table[:, 1]
+    first = int(np.searchsorted(values, low, side="left"))
+    last = int(np.searchsorted(values, high, side="right"))
+    if first >= last:
+        return 0, 0
+
+    before = int(prefix[first - 1]) if first else 0
+    return last - first, int(prefix[last - 1]) - before
+
+
+def parse_ranges(path: str) -> list:
+    """
+    Reads the comma-separated "low-high" ranges of an input file.
 
     Parameters:
         path (str): The path to the input file containing number ranges.
 
     Returns:
-        int: The total sum of all numbers with repeated digit patterns in all ranges.
+        list[tuple[int, int]]: The (low, high) bounds of every range, in order.
     """
     # Read the input file as a single line
     with open(path, "r", encoding="utf-8") as f:
         input_line = f.read().strip()
 
-    total = 0  # Total sum of all numbers with repeated patterns
-    ranges = input_line.split(",")  # Split the line into individual ranges
-
-    # Process each range separately
-    for r in ranges:
+    ranges = []
+    for r in input_line.split(","):
         if not r.strip():  # Skip empty entries
             continue
-
         # Split range into lower and upper bounds
         low_str, high_str = r.split("-")
-        low, high = int(low_str), int(high_str)
+        ranges.append((int(low_str), int(high_str)))
+    return ranges
+
+
+def split_work(ranges: list, parts: int) -> list:
+    """
+    Splits ranges into tasks of balanced width for a process pool.
+
+    Ranges wider than total_width / parts are cut into equal sub-chunks, so a
+    single very wide range cannot keep one worker busy while the others idle.
+
+    Parameters:
+        ranges (list[tuple[int, int]]): The (low, high) bounds of every range.
+        parts (int): The desired number of tasks.
+
+    Returns:
+        list[tuple[int, int, int]]: (range index, low, high) of every task.
+    """
+    total_width = sum(high - low + 1 for low, high in ranges)
+    target = max(1, -(-total_width // max(1, parts)))
+
+    tasks = []
+    for i, (low, high) in enumerate(ranges):
+        pieces = max(1, -(-(high - low + 1) // target))
+        step = -(-(high - low + 1) // pieces)
+        for lo in range(low, high + 1, step):
+            tasks.append((i, lo, min(lo + step - 1, high)))
+    return tasks
+
+
+def evaluate_task(task: tuple) -> dict:
+    """
+    Worker entry point: counts and sums the repeated-pattern numbers of one task.
+
+    Parameters:
+        task (tuple): Range index, low and high bounds, evaluation method
+                      ("generate", "index" or "bruteforce") and index digit bound.
+
+    Returns:
+        dict: Structured record with the range index, bounds, count, sum,
+              wall time in seconds and worker process id.
+    """
+    range_index, low, high, method, index_digits = task
+    start = time.perf_counter()
+
+    if method == "index":
+        count, total = sum_repeated_patterns_indexed(low, high, index_digits)
+    elif method == "bruteforce":
+        count, total = sum_repeated_patterns_bruteforce(low, high)
+    else:
+        count, total = count_and_sum_repeated_patterns(low, high)
 
-        # Measure time taken to process this range
-        start_range = time.time()
-        range_sum = 0  # Sum of repeated-pattern numbers within this range
+    return {
+        "record": "task",
+        "range": range_index,
+        "low": low,
+        "high": high,
+        "count": count,
+        "sum": total,
+        "wall_time": time.perf_counter() - start,
+        "worker": os.getpid(),
+    }
 
-        # Iterate through all numbers in the range, inclusive
-        for n in range(low, high + 1):
-            if is_repeated_pattern(n):
-                range_sum += n  # Accumulate if number has repeated pattern
 
-        total += range_sum
-        # Print performance and partial sum for this range
-        print(
-            f"Range {low}-{high} processed in {time.time() - start_range:.4f}s, sum={range_sum}"
-        )
+def sum_invalid_ids_from_file(
+    path: str,
+    index_digits: int = None,
+    method: str = None,
+    workers: int = None,
+    out=sys.stdout,
+) -> int:
+    """
+    Reads ranges of numbers from a file and sums all numbers that contain repeated patterns.
+
+    The input file is expected to contain a single line with comma-separated ranges,
+    each in the format "low-high". For example:
+        10-20,100-120,200-202
+
+    The ranges, and sub-chunks of very wide ranges, are evaluated across a
+    process pool. The numbers with repeated patterns are generated directly by
+    count_and_sum_repeated_patterns, looked up in the prebuilt index when
+    index_digits is given, or tested one by one with method="bruteforce".
+
+    One JSON record per task (range index, bounds, count, sum, wall time and
+    worker id) is written to `out` as it completes, then one record per input
+    range totalling its tasks, then a summary record. The "record" key of each
+    holds "task", "range" or "summary".
+
+    Parameters:
+        path (str): The path to the input file containing number ranges.
+        index_digits (int): Digit bound of the prebuilt index to answer the
+                            ranges from, or None to generate them directly
+                            (12 when method="index").
+        method (str): "generate", "index" or "bruteforce"; inferred from
+                      index_digits when None.
+        workers (int): Number of worker processes (all cores by default).
+        out (file): Stream receiving the JSON records, or None to disable them.
+
+    Returns:
+        int: The total sum of all numbers with repeated digit patterns in all ranges.
+    """
+    start_total = time.perf_counter()
+    method = method or ("index" if index_digits is not None else "generate")
+    if method == "index" and index_digits is None:
+        index_digits = 12
+    workers = workers or os.cpu_count() or 1
+
+    ranges = parse_ranges(path)
+    tasks = [
+        (i, low, high, method, index_digits)
+        for i, low, high in split_work(ranges, 4 * workers)
+    ]
+
+    if method == "index":
+        # Build the index once here so that the workers only memory-map it
+        load_pattern_index(index_digits)
+
+    total = 0  # Total sum of all numbers with repeated patterns
+    per_range = [
+        {
+            "record": "range",
+            "range": i,
+            "low": low,
+            "high": high,
+            "tasks": 0,
+            "count": 0,
+            "sum": 0,
+            "wall_time": 0.0,
+        }
+        for i, (low, high) in enumerate(ranges)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(evaluate_task, task) for task in tasks]
+        for future in as_completed(futures):
+            record = future.result()
+            total += record["sum"]
+            entry = per_range[record["range"]]
+            entry["tasks"] += 1
+            entry["count"] += record["count"]
+            entry["sum"] += record["sum"]
+            entry["wall_time"] += record["wall_time"]
+            if out is not None:
+                print(json.dumps(record), file=out)
 
-    # Print total sum and overall execution time
-    print(f"Total sum={total}, executed in {time.time() - start_total:.4f}s")
+    if out is not None:
+        for entry in per_range:
+            print(json.dumps(entry), file=out)
+        summary = {
+            "record": "summary",
+            "ranges": len(ranges),
+            "tasks": len(tasks),
+            "sum": total,
+            "wall_time": time.perf_counter() - start_total,
+        }
+        print(json.dumps(summary), file=out)
 
     return total
 
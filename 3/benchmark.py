@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def run_command(command, cwd):
+    """Run a command and measure its execution time."""
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=cwd, capture_output=True, text=True)
+    end = time.perf_counter()
+    output = result.stdout.strip().splitlines()
+    return end - start, output[-1] if output else result.stderr.strip()
+
+
+def main():
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    part1 = os.path.join(base_dir, "Part_1", "part1")
+    part2 = os.path.join(base_dir, "Part_2", "part2")
+    main_py = os.path.join(base_dir, "main.py")
+
+    with tempfile.TemporaryDirectory() as crlf_dir:
+        # Same banks with Windows line endings: both solvers must agree on them too
+        with open(os.path.join(base_dir, "Part_1", "input.txt"), "rb") as f:
+            data = f.read().replace(b"\r\n", b"\n").replace(b"\n", b"\r\n")
+        crlf_input = os.path.join(crlf_dir, "input.txt")
+        with open(crlf_input, "wb") as f:
+            f.write(data)
+
+        # (label, command, working directory), C binaries first as the reference
+        runs = [
+            ("C Part 1 (part1)", [part1], os.path.join(base_dir, "Part_1")),
+            ("NumPy K=2", [sys.executable, main_py, "2"], base_dir),
+            ("C Part 2 (part2)", [part2], os.path.join(base_dir, "Part_2")),
+            ("NumPy K=12", [sys.executable, main_py, "12"], base_dir),
+            ("C Part 1 CRLF", [part1], crlf_dir),
+            ("NumPy K=2 CRLF", [sys.executable, main_py, "2", crlf_input], base_dir),
+            ("C Part 2 CRLF", [part2], crlf_dir),
+            ("NumPy K=12 CRLF", [sys.executable, main_py, "12", crlf_input], base_dir),
+        ]
+
+        print(f"{'Solver':<20} {'Time (s)':<10} Output")
+        print("-" * 60)
+
+        for label, command, cwd in runs:
+            if command[0] != sys.executable and not os.access(command[0], os.X_OK):
+                print(f"{label:<20} {'N/A':<10} Binary not built (run make)")
+                continue
+            elapsed, output = run_command(command, cwd)
+            print(f"{label:<20} {elapsed:<10.4f} {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import os
+import sys
+
+import numpy as np
+
+
+def load_banks(filename):
+    """
+    Load every battery bank of the input as one row of a uint8 matrix.
+
+    The file is read with a single np.frombuffer. When all banks have the same
+    length the matrix is a zero-copy view of the file bytes; otherwise banks
+    are right-aligned in a matrix padded on the left with 0 bytes. A '\\r'
+    before the newline is not part of the bank, like in the C reference which
+    strips "\\r\\n". Any other byte that is not a digit (padding, stray
+    characters) is 0, which sorts below every ASCII digit.
+
+    Args:
+        filename (str): Path to the input file, one bank of digits per line.
+
+    Returns:
+        numpy.ndarray: (banks, width) matrix of ASCII digits or 0 bytes.
+    """
+    with open(filename, "rb") as f:
+        data = f.read()
+    if not data.endswith(b"\n"):
+        data += b"\n"
+
+    buf = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(buf == ord("\n"))
+    starts = np.concatenate(([0], newlines[:-1] + 1))
+    lengths = newlines - starts
+    # Leave out the '\r' of CRLF line endings
+    lengths -= (lengths > 0) & (buf[newlines - 1] == ord("\r"))
+    keep = lengths > 0  # Drop blank lines
+    starts, lengths = starts[keep], lengths[keep]
+    if len(lengths) == 0:
+        return np.zeros((0, 0), dtype=np.uint8)
+
+    width = int(lengths.max())
+    stride = int(newlines[keep][0]) + 1  # Bytes per line, terminator included
+    uniform = len(starts) * stride <= len(buf) and (lengths == width).all()
+    if uniform and (starts == np.arange(len(starts)) * stride).all():
+        # Every line has the same length: view the bytes as a matrix directly
+        banks = buf[: len(starts) * stride].reshape(-1, stride)[:, :width]
+    else:
+        banks = np.zeros((len(starts), width), dtype=np.uint8)
+        rows = np.repeat(np.arange(len(starts)), lengths)
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        cols = width - np.repeat(lengths, lengths) + offsets
+        banks[rows, cols] = buf[np.repeat(starts, lengths) + offsets]
+
+    is_digit = (banks >= ord("0")) & (banks <= ord("9"))
+    if is_digit.all():
+        return banks
+    return np.where(is_digit, banks, 0).astype(np.uint8)
+
+
+def max_joltages(banks, k):
+    """
+    Compute the largest K-digit subsequence of every bank at once.
+
+    The greedy choice is applied to all banks in parallel: the j-th digit is
+    the leftmost maximum in the window that starts after the previous choice
+    and still leaves room for the remaining k - j - 1 digits. Banks shorter
+    than k keep all their digits, like the C implementation.
+
+    Args:
+        banks (numpy.ndarray): Matrix returned by load_banks.
+        k (int): Number of digits to select (2 for Part 1, 12 for Part 2).
+
+    Returns:
+        numpy.ndarray: int64 joltage of every bank.
+
+    Raises:
+        ValueError: If k is not between 1 and 18 (the int64 digit limit).
+    """
+    if not 1 <= k <= 18:
+        raise ValueError(f"K must be between 1 and 18, got {k}")
+
+    n, width = banks.shape
+    if width < k:
+        # Left-pad so that every bank has room for k picks
+        banks = np.pad(banks, ((0, 0), (k - width, 0)))
+        width = k
+
+    values = banks.astype(np.int16)  # Room for the -1 used outside the windows
+    cols = np.arange(width)
+    first = np.zeros(n, dtype=np.int64)  # First column allowed for the next pick
+    picked = np.empty((n, k), dtype=np.uint8)
+
+    for j in range(k):
+        last = width - k + j  # Last column that still leaves room for the rest
+        window = (cols >= first[:, None]) & (cols <= last)
+        choice = np.argmax(np.where(window, values, -1), axis=1)
+        picked[:, j] = banks[np.arange(n), choice]
+        first = choice + 1
+
+    # Padding picks carry no digit: weight each real digit by the ones after it
+    real = picked >= ord("0")
+    digits = np.where(real, picked - ord("0"), 0).astype(np.int64)
+    after = np.cumsum(real[:, ::-1], axis=1)[:, ::-1] - real
+    return (digits * np.where(real, 10**after, 0)).sum(axis=1)
+
+
+def total_joltage(filename, k):
+    """
+    Sum the largest K-digit joltage of every bank of an input file.
+
+    Args:
+        filename (str): Path to the input file.
+        k (int): Number of digits to select per bank.
+
+    Returns:
+        int: The total output joltage.
+    """
+    return sum(max_joltages(load_banks(filename), k).tolist())
+
+
+if __name__ == "__main__":
+    # python main.py [k] [input file]
+    k = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    default_input = os.path.join(os.path.dirname(__file__), "Part_1", "input.txt")
+    input_file = sys.argv[2] if len(sys.argv) > 2 else default_input
+    print(total_joltage(input_file, k))
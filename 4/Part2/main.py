@@ -1,9 +1,19 @@
 import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 
+import numpy as np
 
-def count_neighbors(grid, r, c):
+NEIGHBORHOOD = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+ROLL_BITS = str.maketrans("@.", "10")
+# Below this fraction of rolls the sparse coordinate set beats the dense backends
+SPARSE_DENSITY = 0.1
+
+
+def count_neighbors(grid, r, c, directions=NEIGHBORHOOD):
     rows, cols = len(grid), len(grid[0])
-    directions = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
 
     count = 0
     for dr, dc in directions:
@@ -13,7 +23,7 @@ def count_neighbors(grid, r, c):
     return count
 
 
-def simulate_removal(grid):
+def simulate_removal_naive(grid, threshold=4, neighborhood=NEIGHBORHOOD):
     total_removed = 0
     rows, cols = len(grid), len(grid[0])
     grid = [list(row) for row in grid]
@@ -22,7 +32,7 @@ def simulate_removal(grid):
         to_remove = []
         for r in range(rows):
             for c in range(cols):
-                if grid[r][c] == "@" and count_neighbors(grid, r, c) < 4:
+                if grid[r][c] == "@" and count_neighbors(grid, r, c, neighborhood) < threshold:
                     to_remove.append((r, c))
         if not to_remove:
             break
@@ -34,6 +44,275 @@ def simulate_removal(grid):
     return total_removed
 
 
+def removal_waves(grid, threshold=4, neighborhood=NEIGHBORHOOD):
+    # Flat grid with a border as wide as the neighborhood reach, so neighbors
+    # never need bounds checks
+    rows, cols = len(grid), len(grid[0])
+    pad = max((max(abs(dr), abs(dc)) for dr, dc in neighborhood), default=0)
+    width = cols + 2 * pad
+    offsets = [dr * width + dc for dr, dc in neighborhood]
+
+    alive = [False] * ((rows + 2 * pad) * width)
+    for r, row in enumerate(grid):
+        for c, cell in enumerate(row):
+            if cell == "@":
+                alive[(r + pad) * width + c + pad] = True
+
+    # Neighbor counts are computed once, then only decremented
+    counts = [0] * len(alive)
+    cells = [i for i, is_roll in enumerate(alive) if is_roll]
+    for i in cells:
+        counts[i] = sum(alive[i + o] for o in offsets)
+
+    waves = []
+    wave = [i for i in cells if counts[i] < threshold]
+    while wave:
+        waves.append(len(wave))
+        # The whole wave goes at once, as in the synchronous rescan
+        for i in wave:
+            alive[i] = False
+        next_wave = []
+        for i in wave:
+            # Cells that count i among their neighbors sit at i - o
+            for o in offsets:
+                j = i - o
+                if alive[j]:
+                    counts[j] -= 1
+                    # Queue a roll only when it first drops below the threshold
+                    if counts[j] == threshold - 1:
+                        next_wave.append(j)
+        wave = next_wave
+
+    return waves
+
+
+def to_bitboard(grid):
+    # One integer per row, bit c set when column c holds a roll
+    return [int(row.translate(ROLL_BITS)[::-1] or "0", 2) for row in grid]
+
+
+def add_to_planes(planes, mask):
+    # Bit-sliced ripple-carry adder: planes[i] holds bit i of every column's count
+    for i, plane in enumerate(planes):
+        planes[i] = plane ^ mask
+        mask &= plane
+        if not mask:
+            return
+    planes.append(mask)
+
+
+def below_threshold(planes, threshold, full):
+    # Column-wise "count < threshold", compared bit plane by bit plane from the top
+    less, equal = 0, full
+    for i in reversed(range(max(len(planes), threshold.bit_length()))):
+        plane = planes[i] if i < len(planes) else 0
+        if threshold >> i & 1:
+            less |= equal & ~plane
+            equal &= plane
+        else:
+            equal &= ~plane
+    return less & full
+
+
+def rows_below_threshold(board, width, threshold, neighborhood):
+    # Mask of the columns of every row whose neighbor count is below the threshold
+    full = (1 << width) - 1
+    masks = []
+    for r in range(len(board)):
+        planes = []
+        for dr, dc in neighborhood:
+            if 0 <= r + dr < len(board):
+                row = board[r + dr]
+                add_to_planes(planes, (row >> dc if dc >= 0 else row << -dc) & full)
+        masks.append(below_threshold(planes, threshold, full))
+    return masks
+
+
+def removal_waves_bitboard(grid, threshold=4, neighborhood=NEIGHBORHOOD):
+    # Each wave removes, row by row, every roll whose count is below the threshold
+    board = to_bitboard(grid)
+    width = len(grid[0])
+    waves = []
+    while True:
+        masks = rows_below_threshold(board, width, threshold, neighborhood)
+        removed = [row & mask for row, mask in zip(board, masks)]
+        count = sum(mask.bit_count() for mask in removed)
+        if not count:
+            return waves
+        board = [row ^ mask for row, mask in zip(board, removed)]
+        waves.append(count)
+
+
+def pack_rolls(grid, neighborhood):
+    # Packed coordinates of the rolls only, found with str.find so the cost
+    # tracks the number of rolls, plus the matching neighbor offset table
+    pad = max((max(abs(dr), abs(dc)) for dr, dc in neighborhood), default=0)
+    width = len(grid[0]) + 2 * pad
+    offsets = [dr * width + dc for dr, dc in neighborhood]
+
+    rolls = set()
+    for r, row in enumerate(grid):
+        base = (r + pad) * width + pad
+        c = row.find("@")
+        while c != -1:
+            rolls.add(base + c)
+            c = row.find("@", c + 1)
+    return rolls, offsets
+
+
+def roll_density(grid):
+    return sum(row.count("@") for row in grid) / max(1, len(grid) * len(grid[0]))
+
+
+def removal_waves_sparse(grid, threshold=4, neighborhood=NEIGHBORHOOD):
+    # Same worklist as removal_waves, keyed by packed roll coordinates
+    alive, offsets = pack_rolls(grid, neighborhood)
+    counts = {p: sum(p + o in alive for o in offsets) for p in alive}
+
+    waves = []
+    wave = [p for p, count in counts.items() if count < threshold]
+    while wave:
+        waves.append(len(wave))
+        alive.difference_update(wave)
+        next_wave = []
+        for p in wave:
+            for o in offsets:
+                q = p - o
+                if q in alive:
+                    counts[q] -= 1
+                    if counts[q] == threshold - 1:
+                        next_wave.append(q)
+        wave = next_wave
+
+    return waves
+
+
+def simulate_removal(grid, threshold=4, neighborhood=NEIGHBORHOOD, backend="auto"):
+    if backend == "auto":
+        backend = "sparse" if roll_density(grid) < SPARSE_DENSITY else "worklist"
+    if backend == "naive":
+        return simulate_removal_naive(grid, threshold, neighborhood)
+    if backend == "sparse":
+        return sum(removal_waves_sparse(grid, threshold, neighborhood))
+    if backend == "bitboard":
+        return sum(removal_waves_bitboard(grid, threshold, neighborhood))
+    return sum(removal_waves(grid, threshold, neighborhood))
+
+
+def band_neighbor_counts(block, neighborhood):
+    # block has a one-cell frame (halo rows and empty side columns) around the band
+    rows, cols = block.shape[0] - 2, block.shape[1] - 2
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for dr, dc in neighborhood:
+        counts += block[1 + dr : 1 + dr + rows, 1 + dc : 1 + dc + cols]
+    return counts
+
+
+def band_wave(task):
+    # One synchronous wave on one band of the memory-mapped working grid.
+    # Neighbor bands are only seen through the halo snapshot taken before the
+    # wave, so in-place writes by other workers cannot leak into this wave.
+    path, shape, start, stop, band, bands, halo_name, parity, threshold, neighborhood = task
+    rows, cols = shape
+    shm = shared_memory.SharedMemory(name=halo_name)
+    try:
+        halos = np.ndarray((2, bands, 2, cols), dtype=np.uint8, buffer=shm.buf)
+        grid = np.memmap(path, dtype=np.uint8, mode="r+", shape=(rows, cols + 1))
+
+        block = np.zeros((stop - start + 2, cols + 2), dtype=np.uint8)
+        block[1:-1, 1:-1] = grid[start:stop, :cols] == ord("@")
+        if band > 0:
+            block[0, 1:-1] = halos[parity, band - 1, 1] == ord("@")
+        if band < bands - 1:
+            block[-1, 1:-1] = halos[parity, band + 1, 0] == ord("@")
+
+        removed = (block[1:-1, 1:-1] == 1) & (band_neighbor_counts(block, neighborhood) < threshold)
+        count = int(removed.sum())
+        if count:
+            grid[start:stop, :cols][removed] = ord(".")
+            grid.flush()
+
+        # Publish this band's edge rows for the next wave
+        halos[1 - parity, band, 0] = grid[start, :cols]
+        halos[1 - parity, band, 1] = grid[stop - 1, :cols]
+        del halos, grid
+        return count
+    finally:
+        shm.close()
+
+
+def simulate_removal_banded(filename, band_rows=1024, workers=None, threshold=4,
+                            neighborhood=NEIGHBORHOOD, work_dir=None):
+    # Out-of-core removal: the grid lives in a memory-mapped working copy on
+    # disk, split into horizontal bands processed by a pool. Only the edge rows
+    # of each band (its halos) go through shared memory, so memory stays
+    # bounded by the band size whatever the grid size.
+    if any(abs(dr) > 1 or abs(dc) > 1 for dr, dc in neighborhood):
+        raise ValueError("Banded mode only supports neighborhoods within one cell")
+
+    fd, path = tempfile.mkstemp(suffix=".grid", dir=work_dir)
+    os.close(fd)
+    try:
+        shutil.copyfile(filename, path)
+        with open(path, "rb+") as f:
+            cols = len(f.readline().rstrip(b"\n"))
+            if cols == 0:
+                raise ValueError("Grid is empty")
+            # Terminate the last row so every row is cols + 1 bytes long
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+            size = f.tell()
+        if size % (cols + 1):
+            raise ValueError("Grid rows must all have the same length")
+        rows = size // (cols + 1)
+
+        bounds = [(start, min(start + band_rows, rows)) for start in range(0, rows, band_rows)]
+        bands = len(bounds)
+
+        shm = shared_memory.SharedMemory(create=True, size=2 * bands * 2 * cols)
+        try:
+            halos = np.ndarray((2, bands, 2, cols), dtype=np.uint8, buffer=shm.buf)
+            grid = np.memmap(path, dtype=np.uint8, mode="r", shape=(rows, cols + 1))
+            for band, (start, stop) in enumerate(bounds):
+                halos[0, band, 0] = grid[start, :cols]
+                halos[0, band, 1] = grid[stop - 1, :cols]
+            del grid
+
+            total_removed = 0
+            parity = 0
+            active = list(range(bands))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                while active:
+                    tasks = [
+                        (path, (rows, cols), *bounds[band], band, bands,
+                         shm.name, parity, threshold, neighborhood)
+                        for band in active
+                    ]
+                    removed = dict(zip(active, pool.map(band_wave, tasks)))
+                    total_removed += sum(removed.values())
+
+                    # Bands left out of this wave keep their edge rows
+                    for band in set(range(bands)) - set(active):
+                        halos[1 - parity, band] = halos[parity, band]
+                    parity = 1 - parity
+
+                    # Only bands next to a change can change in the next wave;
+                    # the grid has converged once no band removed anything
+                    changed = [band for band, count in removed.items() if count]
+                    active = sorted(
+                        {b for band in changed for b in (band - 1, band, band + 1) if 0 <= b < bands}
+                    )
+            del halos
+        finally:
+            shm.close()
+            shm.unlink()
+    finally:
+        os.remove(path)
+
+    return total_removed
+
+
 def main():
     try:
         resource_file = os.path.join(os.path.dirname(__file__), "..", "resources.txt")
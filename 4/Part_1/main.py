@@ -1,10 +1,17 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
 
-def count_neighbors(grid, r, c):
+NEIGHBORHOOD = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+ROLL_BITS = str.maketrans("@.", "10")
+# Below this fraction of rolls the sparse coordinate set beats the dense backends
+SPARSE_DENSITY = 0.005
+
+
+def count_neighbors(grid, r, c, directions=NEIGHBORHOOD):
     rows = len(grid)
     cols = len(grid[0])
-    directions = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
 
     count = 0
     for dr, dc in directions:
@@ -14,19 +21,145 @@ def count_neighbors(grid, r, c):
     return count
 
 
-def count_accessible_rolls(grid):
+def count_accessible_rolls_naive(grid, threshold=4, neighborhood=NEIGHBORHOOD):
     rows = len(grid)
     cols = len(grid[0])
     accessible = 0
 
     for r in range(rows):
         for c in range(cols):
-            if grid[r][c] == "@" and count_neighbors(grid, r, c) < 4:
+            if grid[r][c] == "@" and count_neighbors(grid, r, c, neighborhood) < threshold:
                 accessible += 1
 
     return accessible
 
 
+def to_bitboard(grid):
+    # One integer per row, bit c set when column c holds a roll
+    return [int(row.translate(ROLL_BITS)[::-1] or "0", 2) for row in grid]
+
+
+def add_to_planes(planes, mask):
+    # Bit-sliced ripple-carry adder: planes[i] holds bit i of every column's count
+    for i, plane in enumerate(planes):
+        planes[i] = plane ^ mask
+        mask &= plane
+        if not mask:
+            return
+    planes.append(mask)
+
+
+def below_threshold(planes, threshold, full):
+    # Column-wise "count < threshold", compared bit plane by bit plane from the top
+    less, equal = 0, full
+    for i in reversed(range(max(len(planes), threshold.bit_length()))):
+        plane = planes[i] if i < len(planes) else 0
+        if threshold >> i & 1:
+            less |= equal & ~plane
+            equal &= plane
+        else:
+            equal &= ~plane
+    return less & full
+
+
+def rows_below_threshold(board, width, threshold, neighborhood):
+    # Mask of the columns of every row whose neighbor count is below the threshold
+    full = (1 << width) - 1
+    masks = []
+    for r in range(len(board)):
+        planes = []
+        for dr, dc in neighborhood:
+            if 0 <= r + dr < len(board):
+                row = board[r + dr]
+                add_to_planes(planes, (row >> dc if dc >= 0 else row << -dc) & full)
+        masks.append(below_threshold(planes, threshold, full))
+    return masks
+
+
+def pack_rolls(grid, neighborhood):
+    # Packed coordinates of the rolls only, found with str.find so the cost
+    # tracks the number of rolls, plus the matching neighbor offset table
+    pad = max((max(abs(dr), abs(dc)) for dr, dc in neighborhood), default=0)
+    width = len(grid[0]) + 2 * pad
+    offsets = [dr * width + dc for dr, dc in neighborhood]
+
+    rolls = set()
+    for r, row in enumerate(grid):
+        base = (r + pad) * width + pad
+        c = row.find("@")
+        while c != -1:
+            rolls.add(base + c)
+            c = row.find("@", c + 1)
+    return rolls, offsets
+
+
+def roll_density(grid):
+    return sum(row.count("@") for row in grid) / max(1, len(grid) * len(grid[0]))
+
+
+def count_accessible_rolls_sparse(grid, threshold=4, neighborhood=NEIGHBORHOOD):
+    rolls, offsets = pack_rolls(grid, neighborhood)
+    return sum(1 for p in rolls if sum(p + o in rolls for o in offsets) < threshold)
+
+
+def count_accessible_rolls(grid, threshold=4, neighborhood=NEIGHBORHOOD, backend="auto"):
+    if backend == "auto":
+        backend = "sparse" if roll_density(grid) < SPARSE_DENSITY else "bitboard"
+    if backend == "naive":
+        return count_accessible_rolls_naive(grid, threshold, neighborhood)
+    if backend == "sparse":
+        return count_accessible_rolls_sparse(grid, threshold, neighborhood)
+
+    board = to_bitboard(grid)
+    masks = rows_below_threshold(board, len(grid[0]), threshold, neighborhood)
+    return sum((row & mask).bit_count() for row, mask in zip(board, masks))
+
+
+def read_rows(flat, start, stop, cols):
+    # Rows [start, stop) of a memory-mapped grid file, the last row possibly
+    # lacking its newline
+    chunk = np.zeros((stop - start) * (cols + 1), dtype=np.uint8)
+    data = flat[start * (cols + 1) : stop * (cols + 1)]
+    chunk[: len(data)] = data
+    return chunk.reshape(stop - start, cols + 1)[:, :cols]
+
+
+def count_band(task):
+    # Accessible rolls of one band, read from the file with one halo row on each side
+    filename, rows, cols, start, stop, threshold, neighborhood = task
+    flat = np.memmap(filename, dtype=np.uint8, mode="r")
+    top, bottom = max(start - 1, 0), min(stop + 1, rows)
+
+    block = np.zeros((stop - start + 2, cols + 2), dtype=np.uint8)
+    first = 1 - (start - top)
+    block[first : first + bottom - top, 1:-1] = read_rows(flat, top, bottom, cols) == ord("@")
+
+    counts = np.zeros((stop - start, cols), dtype=np.uint8)
+    for dr, dc in neighborhood:
+        counts += block[1 + dr : 1 + dr + stop - start, 1 + dc : 1 + dc + cols]
+    return int(((block[1:-1, 1:-1] == 1) & (counts < threshold)).sum())
+
+
+def count_accessible_rolls_banded(filename, band_rows=1024, workers=None, threshold=4,
+                                  neighborhood=NEIGHBORHOOD):
+    # Out-of-core count: bands of the memory-mapped file are handed to a pool,
+    # so only one band per worker is ever held in memory
+    if any(abs(dr) > 1 or abs(dc) > 1 for dr, dc in neighborhood):
+        raise ValueError("Banded mode only supports neighborhoods within one cell")
+
+    with open(filename, "rb") as f:
+        cols = len(f.readline().rstrip(b"\n"))
+    size = os.path.getsize(filename)
+    rows = -(-size // (cols + 1)) if cols else 0
+
+    tasks = [
+        (filename, rows, cols, start, min(start + band_rows, rows), threshold, neighborhood)
+        for start in range(0, rows, band_rows)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(count_band, tasks))
+
+
 def main():
     try:
         resource_file = os.path.join(os.path.dirname(__file__), "..", "resources.txt")
@@ -1,4 +1,12 @@
+import hashlib
+import json
 import os
+from bisect import bisect_right
+
+import numpy as np
+
+INDEX_DIR = os.path.join(os.path.dirname(__file__), "index")
+INDEX_FORMAT_VERSION = 2
 
 
 def parse_input(filename="resources.txt"):
@@ -24,6 +32,15 @@ def parse_input(filename="resources.txt"):
     return ranges, ids
 
 
+def parse_ids(filename="resources.txt"):
+    # Only the available IDs: the ranges before the blank line are skipped unparsed
+    with open(filename, "r") as f:
+        for line in f:
+            if line.strip() == "":
+                break
+        return [int(line) for line in f if line.strip() != ""]
+
+
 def is_fresh(ingredient_id, ranges):
     for start, end in ranges:
         if start <= ingredient_id <= end:
@@ -31,19 +48,191 @@ def is_fresh(ingredient_id, ranges):
     return False
 
 
-def count_fresh_ids(ranges, available_ids):
+def merge_ranges(ranges):
+    if not ranges:
+        return []
+    ranges = sorted(ranges)
+
+    merged = [ranges[0]]
+
+    for start, end in ranges[1:]:
+        last_start, last_end = merged[-1]
+
+        if start <= last_end + 1:
+            merged[-1] = (last_start, max(last_end, end))
+        else:
+            merged.append((start, end))
+
+    return merged
+
+
+def build_interval_index(ranges):
+    # Disjoint, sorted ranges: an ID is fresh iff it lies in the last range
+    # starting at or before it
+    merged = merge_ranges(ranges)
+    starts = np.array([start for start, _ in merged], dtype=np.int64)
+    ends = np.array([end for _, end in merged], dtype=np.int64)
+    return starts, ends
+
+
+def is_fresh_indexed(ingredient_id, starts, ends):
+    i = bisect_right(starts, ingredient_id) - 1
+    return i >= 0 and ingredient_id <= ends[i]
+
+
+def fresh_mask(ids, starts, ends):
+    # Answer a whole array of IDs with one searchsorted
+    ids = np.asarray(ids, dtype=np.int64)
+    if len(starts) == 0:
+        return np.zeros(ids.shape, dtype=bool)
+    i = np.searchsorted(starts, ids, side="right") - 1
+    return (i >= 0) & (ids <= ends[np.maximum(i, 0)])
+
+
+def file_digest(filename):
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_stat(filename):
+    st = os.stat(filename)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def write_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def write_range_index(index_dir, table, meta):
+    # The arrays go to a new file first; replacing meta.json, which names that
+    # file, is the single atomic step that publishes both, so a crash never
+    # leaves arrays and metadata (with its inserted ranges) out of step
+    os.makedirs(index_dir, exist_ok=True)
+    generation = meta.get("generation", 0) + 1
+    ranges_name = f"ranges-{generation}-{os.getpid()}.npy"
+    tmp_path = os.path.join(index_dir, ranges_name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, table)
+    os.replace(tmp_path, os.path.join(index_dir, ranges_name))
+
+    meta = dict(meta, generation=generation, ranges_file=ranges_name)
+    write_json(os.path.join(index_dir, "meta.json"), meta)
+
+    # Drop the arrays of earlier generations
+    for name in os.listdir(index_dir):
+        if name.startswith("ranges") and name.endswith(".npy") and name != ranges_name:
+            try:
+                os.remove(os.path.join(index_dir, name))
+            except OSError:
+                pass  # Still mapped by a reader on a platform that forbids it
+    return meta
+
+
+def build_range_index(source, index_dir=INDEX_DIR, inserted=(), generation=0):
+    # On-disk index: merged starts and ends as a (2, n) int64 array, tagged
+    # with the hash of the source file; ranges inserted later are kept in the
+    # metadata so that a rebuild replays them
+    ranges, _ = parse_input(source)
+    starts, ends = build_interval_index(ranges + [tuple(r) for r in inserted])
+    meta = {
+        "version": INDEX_FORMAT_VERSION,
+        "generation": generation,
+        "source_sha256": file_digest(source),
+        "source_stat": source_stat(source),
+        "inserted": [list(r) for r in inserted],
+    }
+    return write_range_index(index_dir, np.stack([starts, ends]), meta)
+
+
+def read_index_meta(index_dir):
+    try:
+        with open(os.path.join(index_dir, "meta.json")) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def index_is_current(source, index_dir, meta):
+    if meta is None or meta.get("version") != INDEX_FORMAT_VERSION:
+        return False
+    if not os.path.exists(os.path.join(index_dir, meta["ranges_file"])):
+        return False
+    # Hash the source only when its size or modification time changed
+    stat = source_stat(source)
+    if meta.get("source_stat") == stat:
+        return True
+    if meta.get("source_sha256") != file_digest(source):
+        return False
+    meta["source_stat"] = stat
+    write_json(os.path.join(index_dir, "meta.json"), meta)
+    return True
+
+
+def load_range_index(source, index_dir=INDEX_DIR):
+    # Memory-map the index, rebuilding it first if it is missing, from an
+    # older format, or built from a different version of the source file
+    meta = read_index_meta(index_dir)
+    if not index_is_current(source, index_dir, meta):
+        meta = build_range_index(
+            source,
+            index_dir,
+            meta.get("inserted", ()) if meta else (),
+            meta.get("generation", 0) if meta else 0,
+        )
+
+    table = np.load(os.path.join(index_dir, meta["ranges_file"]), mmap_mode="r")
+    return table[0], table[1]
+
+
+def insert_range(index_dir, start, end):
+    # Merge one new range locally: only the run of ranges it touches is
+    # replaced, the rest of the arrays is copied through unchanged
+    meta = read_index_meta(index_dir)
+    if meta is None or meta.get("version") != INDEX_FORMAT_VERSION:
+        raise FileNotFoundError(f"No range index in {index_dir}")
+
+    table = np.load(os.path.join(index_dir, meta["ranges_file"]), mmap_mode="r")
+    starts, ends = table[0], table[1]
+    meta["inserted"].append([start, end])
+    lo = int(np.searchsorted(ends, start - 1, side="left"))
+    hi = int(np.searchsorted(starts, end + 1, side="right"))
+    if lo < hi:
+        start, end = min(start, int(starts[lo])), max(end, int(ends[hi - 1]))
+
+    updated = np.concatenate(
+        [table[:, :lo], np.array([[start], [end]], dtype=np.int64), table[:, hi:]], axis=1
+    )
+    del table, starts, ends  # Release the map before the old file is removed
+
+    write_range_index(index_dir, updated, meta)
+    return updated[0], updated[1]
+
+
+def count_fresh_ids_naive(ranges, available_ids):
     return sum(1 for x in available_ids if is_fresh(x, ranges))
 
 
+def count_fresh_ids(ranges, available_ids):
+    starts, ends = build_interval_index(ranges)
+    return int(fresh_mask(available_ids, starts, ends).sum())
+
+
 def main():
     try:
         resource_file = os.path.join(os.path.dirname(__file__), "..", "resources.txt")
-        ranges, ids = parse_input(resource_file)
+        ids = parse_ids(resource_file)
+        starts, ends = load_range_index(resource_file)
     except FileNotFoundError:
         print("Error: 'resources.txt' file not found.")
         return
 
-    result = count_fresh_ids(ranges, ids)
+    result = int(fresh_mask(ids, starts, ends).sum())
     print("Number of fresh ingredient IDs:", result)
 
 
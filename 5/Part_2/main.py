@@ -1,4 +1,8 @@
+import heapq
 import os
+import tempfile
+from array import array
+from bisect import bisect_right
 
 
 def parse_ranges(filename="resources.txt"):
@@ -33,6 +37,154 @@ def merge_ranges(ranges):
     return merged
 
 
+class RangeSet:
+    """
+    Set of integers stored as sorted, disjoint, non-adjacent inclusive ranges
+    (the representation produced by merge_ranges), kept in two compact
+    array('q') columns. Set operations walk both operands once, in O(n + m).
+    Iterating a RangeSet yields its (start, end) ranges.
+    """
+
+    def __init__(self, starts=(), ends=()):
+        # starts and ends must already be merged; use from_ranges otherwise
+        self.starts = array("q", starts)
+        self.ends = array("q", ends)
+
+    @classmethod
+    def from_sorted(cls, ranges):
+        # Coalesce ranges arriving sorted by start, in one streaming pass
+        result = cls()
+        starts, ends = result.starts, result.ends
+        for start, end in ranges:
+            if ends and start <= ends[-1] + 1:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+        return result
+
+    @classmethod
+    def from_ranges(cls, ranges):
+        return cls.from_sorted(sorted(ranges))
+
+    @classmethod
+    def from_file(cls, filename, run_size=1_000_000, tmp_dir=None):
+        # External sort: ranges are read in runs of run_size, each run is
+        # sorted and spilled to a temporary binary file, and the runs are
+        # combined with a k-way merge that coalesces on the fly
+        runs = []
+        try:
+            batch = []
+            with open(filename, "r") as f:
+                for line in f:
+                    line = line.strip()
+                    if line == "":
+                        break
+                    start, end = map(int, line.split("-"))
+                    batch.append((start, end))
+                    if len(batch) >= run_size:
+                        runs.append(cls._spill(batch, tmp_dir))
+                        batch = []
+            if not runs:
+                return cls.from_ranges(batch)
+            if batch:
+                runs.append(cls._spill(batch, tmp_dir))
+            return cls.from_sorted(heapq.merge(*(cls._read_run(run) for run in runs)))
+        finally:
+            for run in runs:
+                os.remove(run)
+
+    @staticmethod
+    def _spill(batch, tmp_dir):
+        batch.sort()
+        fd, path = tempfile.mkstemp(suffix=".run", dir=tmp_dir)
+        with os.fdopen(fd, "wb") as f:
+            array("q", (value for pair in batch for value in pair)).tofile(f)
+        return path
+
+    @staticmethod
+    def _read_run(path, block=1 << 16):
+        with open(path, "rb") as f:
+            while True:
+                values = array("q")
+                try:
+                    values.fromfile(f, 2 * block)
+                except EOFError:
+                    pass  # Last, partial block
+                if not values:
+                    return
+                yield from zip(values[0::2], values[1::2])
+
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+
+    def __len__(self):
+        # Number of ranges; see cardinality for the number of integers
+        return len(self.starts)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, RangeSet)
+            and self.starts == other.starts
+            and self.ends == other.ends
+        )
+
+    def __repr__(self):
+        return f"RangeSet({list(self)})"
+
+    def __contains__(self, value):
+        i = bisect_right(self.starts, value) - 1
+        return i >= 0 and value <= self.ends[i]
+
+    def cardinality(self):
+        return sum(self.ends) - sum(self.starts) + len(self.starts)
+
+    def union(self, other):
+        return RangeSet.from_sorted(heapq.merge(self, other))
+
+    def intersection(self, other):
+        result = RangeSet()
+        i = j = 0
+        while i < len(self.starts) and j < len(other.starts):
+            lo = max(self.starts[i], other.starts[j])
+            hi = min(self.ends[i], other.ends[j])
+            if lo <= hi:
+                result.starts.append(lo)
+                result.ends.append(hi)
+            # Drop whichever range finishes first
+            if self.ends[i] < other.ends[j]:
+                i += 1
+            else:
+                j += 1
+        return result
+
+    def difference(self, other):
+        result = RangeSet()
+        j = 0
+        for start, end in self:
+            # Skip the ranges of other that end before this one starts
+            while j < len(other.starts) and other.ends[j] < start:
+                j += 1
+            k = j
+            while k < len(other.starts) and other.starts[k] <= end:
+                if other.starts[k] > start:
+                    result.starts.append(start)
+                    result.ends.append(other.starts[k] - 1)
+                start = other.ends[k] + 1
+                if start > end:
+                    break
+                k += 1
+            if start <= end:
+                result.starts.append(start)
+                result.ends.append(end)
+        return result
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+
 def count_fresh_ids(ranges):
     merged = merge_ranges(ranges)
     total = 0
@@ -1,85 +1,110 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
 
-def load_grid(filename="resources.txt"):
-    with open(filename, "r") as f:
-        lines = [line.rstrip("\n") for line in f]
-    width = max(len(line) for line in lines)
-    return [line.ljust(width) for line in lines]
+try:
+    # Optional fast multiplication backend for very large operands
+    import gmpy2
+except ImportError:
+    gmpy2 = None
 
+# Every byte that is not an ASCII digit, for bytes.translate(None, NON_DIGITS)
+NON_DIGITS = bytes(b for b in range(256) if not ord("0") <= b <= ord("9"))
 
-def split_into_blocks(grid):
-    height = len(grid)
-    width = len(grid[0])
 
-    blocks = []
-    current_cols = []
+def load_byte_grid(filename="resources.txt"):
+    """
+    Load the worksheet as a 2D uint8 view of the file bytes, padded with spaces.
 
-    def flush():
-        if current_cols:
-            blocks.append(current_cols[:])
+    When every line has the same length the matrix is a zero-copy reshape of
+    the bytes; otherwise lines are copied into a space-filled matrix.
+    """
+    with open(filename, "rb") as f:
+        data = f.read()
+    if not data.endswith(b"\n"):
+        data += b"\n"
 
-    for c in range(width):
-        if all(grid[r][c] == " " for r in range(height)):
-            flush()
-            current_cols = []
-        else:
-            current_cols.append(c)
+    buf = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(buf == ord("\n"))
+    starts = np.concatenate(([0], newlines[:-1] + 1))
+    lengths = newlines - starts
+    width = int(lengths.max())
 
-    flush()
-    return blocks
+    if (lengths == width).all():
+        return buf.reshape(len(lengths), width + 1)[:, :width]
 
+    grid = np.full((len(lengths), width), ord(" "), dtype=np.uint8)
+    for r, (start, length) in enumerate(zip(starts, lengths)):
+        grid[r, :length] = buf[start : start + length]
+    return grid
 
-def extract_problem(grid, cols):
-    height = len(grid)
 
-    numbers = []
+def split_byte_blocks(grid):
+    """Split the byte grid into (first, stop) column spans, using one reduction to find blank columns."""
+    blank = (grid == ord(" ")).all(axis=0)
+    # Spans start where a non-blank column follows a blank one (or the edge)
+    edges = np.diff(np.concatenate(([True], blank, [True])).astype(np.int8))
+    return list(zip(np.flatnonzero(edges == -1), np.flatnonzero(edges == 1)))
+
+
+def read_operator(block):
+    """Return the first operator found in the bottom row of a block view."""
+    ops = block[-1][(block[-1] == ord("+")) | (block[-1] == ord("*"))]
+    return chr(ops[0]) if len(ops) else None
+
 
-    # Rows except last = numbers
-    for r in range(height - 1):
-        row = grid[r]
-        # Keep only chars inside block columns
-        segment = "".join(row[c] for c in cols)
-        # Extract digits
-        digits = "".join(ch for ch in segment if ch.isdigit())
+def extract_rows(block):
+    """Part 1 reading of a block view: one number per row, digits left to right."""
+    numbers = []
+    for row in block[:-1]:
+        digits = row.tobytes().translate(None, NON_DIGITS)
         if digits:
             numbers.append(int(digits))
+    return numbers, read_operator(block)
 
-    # Last row = operator
-    op_row = grid[-1]
-    op = None
-    for c in cols:
-        if op_row[c] in "+*":
-            op = op_row[c]
-            break
 
-    return numbers, op
+def product_tree(numbers):
+    # Multiply pairwise, level by level, so operands stay balanced in size
+    # instead of multiplying one ever-growing product by small factors
+    if gmpy2 is not None:
+        numbers = [gmpy2.mpz(n) for n in numbers]
+    level = list(numbers) or [1]
+    while len(level) > 1:
+        paired = [level[i] * level[i + 1] for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return int(level[0])
 
 
 def solve_problem(numbers, op):
     if op == "+":
         return sum(numbers)
     else:  # op == "*"
-        prod = 1
-        for n in numbers:
-            prod *= n
-        return prod
+        return product_tree(numbers)
+
+
+def solve_problems(problems, workers=1):
+    # Independent (numbers, op) blocks, spread over a process pool when workers != 1
+    if workers == 1:
+        return [solve_problem(numbers, op) for numbers, op in problems]
+    if not problems:
+        return []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(solve_problem, *zip(*problems)))
 
 
 def main():
     try:
         resources_file = os.path.join(os.path.dirname(__file__), "..",  "resources.txt")
-        grid = load_grid(resources_file)
+        grid = load_byte_grid(resources_file)
     except FileNotFoundError:
         print("Missing resources.txt")
         return
 
-    blocks = split_into_blocks(grid)
-    total = 0
-
-    for cols in blocks:
-        nums, op = extract_problem(grid, cols)
-        total += solve_problem(nums, op)
+    problems = [extract_rows(grid[:, first:stop]) for first, stop in split_byte_blocks(grid)]
+    total = sum(solve_problems(problems))
 
     print("Grand total:", total)
 
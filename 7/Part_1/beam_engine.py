@@ -0,0 +1,63 @@
+import os
+
+
+def load_grid(filename="resources.txt"):
+    with open(filename, "r") as f:
+        return [list(line.rstrip("\n")) for line in f]
+
+
+def find_start(grid):
+    for r, row in enumerate(grid):
+        for c, val in enumerate(row):
+            if val == "S":
+                return r, c
+    raise ValueError("Start 'S' not found")
+
+
+def propagate_rows(grid):
+    """
+    Propagate the beams row by row without rendering anything.
+
+    The active beams of a row are a set of columns, so beams that merge are
+    processed once. Yields, for every row reached, the row index, the sorted
+    columns newly crossed by a beam (the cells the animation marks '|') and
+    the number of splitters hit in that row.
+    """
+    rows, cols = len(grid), len(grid[0])
+    start_r, start_c = find_start(grid)
+    active = {start_c}
+
+    for r in range(start_r + 1, rows):
+        next_active = set()
+        marked = []
+        divisions = 0
+        last_row = r + 1 >= rows
+
+        for c in sorted(active):
+            cell = grid[r][c]
+            if cell == "^":
+                divisions += 1
+                if not last_row:
+                    if c - 1 >= 0:
+                        next_active.add(c - 1)
+                    if c + 1 < cols:
+                        next_active.add(c + 1)
+            elif cell == ".":
+                marked.append(c)
+                if not last_row:
+                    next_active.add(c)
+
+        yield r, marked, divisions
+        if not next_active:
+            break
+        active = next_active
+
+
+def count_divisions(grid):
+    return sum(divisions for _, _, divisions in propagate_rows(grid))
+
+
+if __name__ == "__main__":
+    resources_file = os.path.join(os.path.dirname(__file__), "..", "resources.txt")
+    grid = load_grid(resources_file)
+    print("Total divisions:", count_divisions(grid))
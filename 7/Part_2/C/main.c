@@ -1,4 +1,5 @@
 #define _POSIX_C_SOURCE 199309L
+#include <limits.h>
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
@@ -121,6 +122,81 @@ unsigned long long count_timelines(char **grid, int rows, int cols)
     return total;
 }
 
+// Add value to *acc, returning 1 if the sum wraps around
+static int add_checked(unsigned long long *acc, unsigned long long value)
+{
+    int overflow = *acc > ULLONG_MAX - value;
+    *acc += value;
+    return overflow;
+}
+
+// Count timelines on a flat buffer of `rows` lines of `cols` cells, each line
+// starting `stride` bytes after the previous one (e.g. the raw input file, so
+// the grid can be shared with Python without copying). Counts the timelines
+// leaving the bottom of the grid; splits off the sides are dropped.
+// Returns 0 on success, -1 if 'S' is missing, -2 if allocation fails and
+// 1 if the count does not fit in 64 bits.
+int count_timelines_buffer(const char *cells, int rows, int cols, long stride, unsigned long long *total)
+{
+    int start_r = -1, start_c = -1;
+    for (int r = 0; r < rows && start_r < 0; r++)
+    {
+        const char *found = memchr(cells + r * stride, 'S', cols);
+        if (found)
+        {
+            start_r = r;
+            start_c = (int)(found - (cells + r * stride));
+        }
+    }
+    if (start_r < 0)
+        return -1;
+
+    unsigned long long *current = calloc(cols, sizeof(unsigned long long));
+    unsigned long long *next = calloc(cols, sizeof(unsigned long long));
+    if (!current || !next)
+    {
+        free(current);
+        free(next);
+        return -2;
+    }
+    current[start_c] = 1;
+
+    int status = 0;
+    for (int r = start_r + 1; r < rows && status == 0; r++)
+    {
+        const char *row = cells + r * stride;
+        memset(next, 0, cols * sizeof(unsigned long long));
+        for (int c = 0; c < cols; c++)
+        {
+            unsigned long long count = current[c];
+            if (count == 0)
+                continue;
+
+            if (row[c] == '.')
+                status |= add_checked(&next[c], count);
+            else if (row[c] == '^')
+            {
+                if (c - 1 >= 0)
+                    status |= add_checked(&next[c - 1], count);
+                if (c + 1 < cols)
+                    status |= add_checked(&next[c + 1], count);
+            }
+        }
+        unsigned long long *tmp = current;
+        current = next;
+        next = tmp;
+    }
+
+    unsigned long long sum = 0;
+    for (int c = 0; c < cols; c++)
+        status |= add_checked(&sum, current[c]);
+
+    free(current);
+    free(next);
+    *total = sum;
+    return status;
+}
+
 int main()
 {
     char **grid;
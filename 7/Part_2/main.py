@@ -1,11 +1,15 @@
+import math
 import os
-import time
-from copy import deepcopy
-from flask import Flask, Response, render_template_string
-from collections import deque
+import sys
+from flask import Flask, Response, render_template_string, request
+
+from main_sparse import timeline_rows
+
+# The SSE broadcast layer is shared by both parts of the day
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from broadcast import DEFAULT_FPS, client_script, shared_log  # noqa: E402
 
 app = Flask(__name__)
-TIME_DELAY = 0.001  # Delay between frames in seconds
 
 
 def load_grid(filename="resources.txt"):
@@ -13,76 +17,28 @@ def load_grid(filename="resources.txt"):
         return [list(line.rstrip("\n")) for line in f]
 
 
-def find_start(grid):
-    for r, row in enumerate(grid):
-        for c, val in enumerate(row):
-            if val == "S":
-                return r, c
-    raise ValueError("Start 'S' not found")
-
-
-def in_bounds(grid, r, c):
-    return 0 <= r < len(grid) and 0 <= c < len(grid[0])
-
-
-def process_cell(g, r, c, stack, prioritize_right):
-    """Process a single cell and add next states to stack."""
-    cell = g[r][c]
-    if cell == "^":
-        moves = (
-            [(r + 1, c + 1), (r + 1, c - 1)]
-            if prioritize_right
-            else [(r + 1, c - 1), (r + 1, c + 1)]
-        )
-        for nr, nc in moves:
-            if in_bounds(g, nr, nc):
-                stack.append((deepcopy(g), nr, nc))
-    elif cell == ".":
-        g[r][c] = "|"
-        if in_bounds(g, r + 1, c):
-            stack.append((g, r + 1, c))
-
-
-def generate_timelines(grid, prioritize_right=False):
-    start_r, start_c = find_start(grid)
-    stack = [(deepcopy(grid), start_r + 1, start_c)]
-    while stack:
-        g, r, c = stack.pop()
-        if not in_bounds(g, r, c):
-            yield g
-            continue
-        process_cell(g, r, c, stack, prioritize_right)
-        yield g
-
-
-def display_timelines_merged(grid):
-    left_gen = generate_timelines(deepcopy(grid), prioritize_right=False)
-    right_gen = generate_timelines(deepcopy(grid), prioritize_right=True)
-    count = 0
-
-    while True:
-        try:
-            left = next(left_gen)
-            right = next(right_gen)
-            count += 1
-        except StopIteration:
-            break
-        merged = []
-        for lr, rr, original in zip(left, right, grid):
-            row = []
-            for lcell, rcell, ocell in zip(lr, rr, original):
-                if ocell in ("S", "^"):
-                    row.append(ocell)
-                elif lcell == "|" or rcell == "|":
-                    row.append("|")
-                else:
-                    row.append(".")
-            merged.append(row)
-        html_grid = "<br>".join("".join(row) for row in merged)
-        yield f"data: DISPLAY:{html_grid}\n\n"
-        time.sleep(TIME_DELAY)
-
-    yield f"data: FINAL_COUNT:{count}\n\n"
+def timeline_heatmap(grid, levels=9):
+    """
+    Producer for the shared broadcast: one frame per row of the sparse DP,
+    marking every cell crossed by timelines with an intensity digit from 1 to
+    `levels`, on a log scale of the number of timelines through the cell.
+    """
+    rows = list(timeline_rows(grid))
+    # The last entry holds the timelines leaving the bottom of the grid
+    _, exits = rows.pop()
+    peak = max((n for _, counts in rows for n in counts.values()), default=1)
+    scale = math.log1p(peak)
+
+    for r, counts in rows:
+        cells = [
+            (r, c, str(1 + int((levels - 1) * math.log1p(n) / scale)))
+            for c, n in sorted(counts.items())
+            if grid[r][c] == "."
+        ]
+        if cells:
+            yield cells
+
+    yield f"FINAL_COUNT:{sum(exits.values())}"
 
 
 # --- Flask routes ---
@@ -90,24 +46,42 @@ HTML_TEMPLATE = """
 <!doctype html>
 <html>
 <head>
-<title>Quantum Tachyon Beam - Merged Timelines</title>
+<title>Quantum Tachyon Beam - Timeline Heatmap</title>
 <style>
   body { font-family: monospace; white-space: pre; }
   .grid { line-height: 1.1; }
 </style>
 </head>
 <body>
-<h2>Quantum Tachyon Beam - Merged Timelines</h2>
+<h2>Quantum Tachyon Beam - Timeline Heatmap</h2>
 <div class="grid" id="timeline"></div>
 <p id="count"></p>
 <script>
-var evtSource = new EventSource("/stream");
+{{ client_script|safe }}
+// Intensity digits are drawn as beams shaded from dim to bright
+function renderHeat(lines) {
+    return lines.map(function(line) {
+        return line.map(function(ch) {
+            if (ch < "1" || ch > "9") return ch;
+            var light = 85 - 6 * parseInt(ch);
+            return '<span style="background:hsl(20,100%,' + light + '%)">|</span>';
+        }).join("");
+    }).join("<br>");
+}
+var lines = [];
+var evtSource = new EventSource(streamUrl);
 evtSource.onmessage = function(e) {
-    if(e.data.startsWith("DISPLAY:")) {
-        document.getElementById("timeline").innerHTML = e.data.slice(8);
+    if(e.data.startsWith("INIT:")) {
+        lines = parseGrid(e.data.slice(5));
+        document.getElementById("timeline").innerHTML = renderHeat(lines);
+    } else if(e.data.startsWith("CELLS:")) {
+        applyCells(lines, e.data.slice(6));
+        document.getElementById("timeline").innerHTML = renderHeat(lines);
     } else if(e.data.startsWith("FINAL_COUNT:")) {
         document.getElementById("count").textContent = "Total timelines: " + e.data.slice(12);
         evtSource.close();
+    } else if(e.data === "END") {
+        evtSource.close();
     }
 };
 </script>
@@ -118,18 +92,21 @@ evtSource.onmessage = function(e) {
 
 @app.route("/")
 def index():
-    return render_template_string(HTML_TEMPLATE)
+    return render_template_string(HTML_TEMPLATE, client_script=client_script(live=False))
 
 
 @app.route("/stream")
 def stream():
+    # Every viewer subscribes to the same simulation, at its own frame rate
+    resources_file = os.path.join(os.path.dirname(__file__), "..", "resources.txt")
     try:
-        resources_file = os.path.join(os.path.dirname(__file__), "..", "resources.txt")
-        grid = load_grid(resources_file)
+        log = shared_log(resources_file, load_grid, timeline_heatmap)
     except FileNotFoundError:
         return "Missing resources.txt", 404
 
-    return Response(display_timelines_merged(grid), mimetype="text/event-stream")
+    fps = request.args.get("fps", DEFAULT_FPS, type=float)
+    live = request.args.get("live", 0, type=int)
+    return Response(log.subscribe(fps, live=bool(live)), mimetype="text/event-stream")
 
 
 if __name__ == "__main__":
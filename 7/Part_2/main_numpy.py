@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+
+# Above this, a cell of the next row (pass-through + two neighbours) could overflow int64
+INT64_SAFE_MAX = np.iinfo(np.int64).max // 3
+
+
+def load_grid(filename="resources.txt"):
+    with open(filename, "r") as f:
+        return [list(line.rstrip("\n")) for line in f]
+
+
+def grid_cells(grid):
+    # Byte matrix of the grid, one uint8 per cell
+    return np.array(["".join(row) for row in grid], dtype=bytes).view(np.uint8).reshape(len(grid), -1)
+
+
+def count_timelines_numpy(grid, modulus=None):
+    return count_timelines_cells(grid_cells(grid), modulus)
+
+
+def count_timelines_cells(cells, modulus=None):
+    """
+    Count the timelines with a single row vector updated in three array operations.
+
+    Each row is "pass-through + shifted-left + shifted-right": counts on '.'
+    cells go straight down, counts on '^' cells go one column left and one
+    column right. Counts are kept in int64 while they are safe, and the
+    vector switches to Python integers (object dtype) before any cell could
+    overflow. With a modulus, counts stay in int64 and the result is the
+    number of timelines modulo it.
+
+    Args:
+        cells (np.ndarray): The grid as a uint8 matrix (any 2D view works,
+            e.g. the raw input file reshaped with its newlines sliced off).
+        modulus (int | None): Optional modulus, at most INT64_SAFE_MAX + 1.
+
+    Returns:
+        int: Total number of timelines leaving the bottom of the grid.
+    """
+    if modulus is not None and not 0 < modulus <= INT64_SAFE_MAX + 1:
+        raise ValueError(f"Modulus must be between 1 and {INT64_SAFE_MAX + 1}")
+
+    rows, cols = cells.shape
+    starts = np.flatnonzero(cells == ord("S"))
+    if len(starts) == 0:
+        raise ValueError("Start 'S' not found")
+    start_r, start_c = divmod(int(starts[0]), cols)
+    straight, split = cells == ord("."), cells == ord("^")
+
+    current = np.zeros(cols, dtype=np.int64)
+    current[start_c] = 1 if modulus is None else 1 % modulus
+
+    for r in range(start_r + 1, rows):
+        if current.dtype == np.int64 and modulus is None and current.max() > INT64_SAFE_MAX:
+            current = current.astype(object)
+
+        splitting = np.where(split[r], current, 0)
+        next_line = np.where(straight[r], current, 0)
+        next_line[:-1] += splitting[1:]
+        next_line[1:] += splitting[:-1]
+
+        if modulus is not None:
+            next_line %= modulus
+        current = next_line
+
+    total = current.sum() if current.dtype == object else sum(current.tolist())
+    return int(total) if modulus is None else int(total) % modulus
+
+
+if __name__ == "__main__":
+    resources_file = os.path.join(os.path.dirname(__file__), "..", "resources.txt")
+    grid = load_grid(resources_file)
+    total = count_timelines_numpy(grid)
+    print("Total timelines:", total)
@@ -0,0 +1,150 @@
+import os
+import random
+
+from main_sparse import find_start, load_grid
+
+
+class TimelineIndex:
+    """
+    Direct access to individual timelines of the tachyon manifold.
+
+    A reverse pass of the timeline DP stores, for every cell, the number of
+    timelines that go from that cell to the bottom of the grid. With these
+    suffix counts, timelines can be numbered in left-first order (at every
+    splitter, all timelines taking the left branch come before those taking
+    the right one), and the k-th timeline is found by walking down the grid
+    once, without enumerating its predecessors.
+
+    A timeline is represented by the list of (row, column) cells it crosses,
+    from the row below 'S' to the last row, followed by the point (rows,
+    column) where it leaves the grid.
+    """
+
+    def __init__(self, grid):
+        """
+        Build the suffix counts of a grid.
+
+        Args:
+            grid (list[list[str]]): The 2D grid.
+        """
+        self.grid = grid
+        self.rows, self.cols = len(grid), len(grid[0])
+        self.start_r, self.start_c = find_start(grid)
+
+        # suffix[r][c]: timelines from (r, c) to the bottom; row `rows` is the exit
+        self.suffix = [None] * (self.rows + 1)
+        self.suffix[self.rows] = [1] * self.cols
+        for r in range(self.rows - 1, self.start_r, -1):
+            below = self.suffix[r + 1]
+            counts = [0] * self.cols
+            for c, cell in enumerate(grid[r]):
+                if cell == ".":
+                    counts[c] = below[c]
+                elif cell == "^":
+                    counts[c] = self._left(below, c) + self._right(below, c)
+            self.suffix[r] = counts
+
+        self.total = self.suffix[self.start_r + 1][self.start_c]
+
+    def _left(self, below, c):
+        return below[c - 1] if c - 1 >= 0 else 0
+
+    def _right(self, below, c):
+        return below[c + 1] if c + 1 < self.cols else 0
+
+    def unrank(self, k):
+        """
+        Return the k-th timeline in left-first order, in O(rows).
+
+        Args:
+            k (int): Index of the timeline, from 0 to total - 1.
+
+        Returns:
+            list[tuple[int, int]]: The cells crossed by the timeline.
+
+        Raises:
+            IndexError: If k is out of range.
+        """
+        if not 0 <= k < self.total:
+            raise IndexError(f"Timeline index out of range: {k}")
+
+        path = []
+        c = self.start_c
+        for r in range(self.start_r + 1, self.rows):
+            path.append((r, c))
+            if self.grid[r][c] == "^":
+                left = self._left(self.suffix[r + 1], c)
+                if k < left:
+                    c -= 1
+                else:
+                    k -= left
+                    c += 1
+        path.append((self.rows, c))
+        return path
+
+    def rank(self, path):
+        """
+        Return the index of a timeline in left-first order, in O(rows).
+
+        Args:
+            path (list[tuple[int, int]]): The cells crossed by the timeline,
+                as returned by unrank.
+
+        Returns:
+            int: The index of the timeline.
+
+        Raises:
+            ValueError: If the path is not a timeline of the grid.
+        """
+        expected = list(range(self.start_r + 1, self.rows + 1))
+        if [r for r, _ in path] != expected or path[0][1] != self.start_c:
+            raise ValueError("Path does not start below 'S' and reach the bottom")
+
+        k = 0
+        for (r, c), (_, next_c) in zip(path, path[1:]):
+            cell = self.grid[r][c] if 0 <= c < self.cols else None
+            if cell == "^" and next_c == c + 1:
+                k += self._left(self.suffix[r + 1], c)
+            elif not (cell == "^" and next_c == c - 1 or cell == "." and next_c == c):
+                raise ValueError(f"Invalid move at {(r, c)}")
+        if not 0 <= path[-1][1] < self.cols:
+            raise ValueError("Path leaves the grid through a side")
+        return k
+
+    def sample(self, rng=random):
+        """
+        Return a uniformly random timeline, in O(rows).
+
+        Args:
+            rng (random.Random): Source of randomness.
+
+        Returns:
+            list[tuple[int, int]]: The cells crossed by the timeline.
+        """
+        return self.unrank(rng.randrange(self.total))
+
+    def render(self, path):
+        """
+        Draw a timeline on a copy of the grid.
+
+        Args:
+            path (list[tuple[int, int]]): The cells crossed by the timeline.
+
+        Returns:
+            list[list[str]]: The grid with the timeline's empty cells marked '|'.
+        """
+        g = [list(row) for row in self.grid]
+        for r, c in path[:-1]:
+            if g[r][c] == ".":
+                g[r][c] = "|"
+        return g
+
+
+if __name__ == "__main__":
+    resources_file = os.path.join(os.path.dirname(__file__), "..", "resources.txt")
+    index = TimelineIndex(load_grid(resources_file))
+    print("Total timelines:", index.total)
+
+    k = random.randrange(index.total)
+    path = index.unrank(k)
+    print(f"Timeline #{k} exits at column {path[-1][1]}, rank check: {index.rank(path)}")
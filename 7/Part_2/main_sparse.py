@@ -15,12 +15,14 @@ def find_start(grid):
     raise ValueError("Start 'S' not found")
 
 
-def count_timelines_super_fast(grid):
+def timeline_rows(grid):
+    # Yield (row, {column: timelines reaching that cell}) for every row below 'S'
     rows, cols = len(grid), len(grid[0])
     start_r, start_c = find_start(grid)
     current = {start_c: 1}
 
     for r in range(start_r + 1, rows):
+        yield r, current
         next_line = defaultdict(int)
         for c, count in current.items():
             cell = grid[r][c]
@@ -32,6 +34,12 @@ def count_timelines_super_fast(grid):
                 if c + 1 < cols:
                     next_line[c + 1] += count
         current = next_line
+    yield rows, current
+
+
+def count_timelines_super_fast(grid):
+    for _, current in timeline_rows(grid):
+        pass
     return sum(current.values())
 
 
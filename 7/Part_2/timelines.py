@@ -0,0 +1,196 @@
+import ctypes
+import os
+from functools import cached_property
+
+import numpy as np
+
+from main_dynamic_programming import count_timelines_dp
+from main_lru_cache import count_timelines as count_timelines_lru
+from main_numpy import count_timelines_cells
+from main_sparse import count_timelines_super_fast
+
+LIBRARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "C", "bin", "libtimelines.so")
+
+# Below this many cells, NumPy's per-row overhead outweighs the dict-based sparse DP
+SMALL_GRID = 10000
+# Below this fraction of splitters, beams rarely fan out and the sparse DP wins
+SPARSE_DENSITY = 0.25
+
+BACKENDS = {}
+
+
+def register_backend(name):
+    """
+    Register a timeline counter under a name usable as count_timelines(backend=...).
+
+    The decorated function receives a Manifold and returns the number of timelines.
+    """
+
+    def decorator(func):
+        BACKENDS[name] = func
+        return func
+
+    return decorator
+
+
+class Manifold:
+    """
+    A tachyon manifold parsed once and shared by every backend.
+
+    The grid is kept as the raw bytes of the input file; the NumPy and C
+    backends read it in place through a (rows, stride) view, and the
+    list-of-lists grid used by the pure Python backends is only built when
+    one of them asks for it.
+    """
+
+    def __init__(self, data):
+        """
+        Args:
+            data (bytes): Rows of the grid separated by newlines.
+
+        Raises:
+            ValueError: If the grid is empty or its rows differ in length.
+        """
+        data = bytes(data)
+        if not data.endswith(b"\n"):
+            data += b"\n"
+        self.data = data
+        self.stride = data.index(b"\n") + 1
+        self.rows, self.cols = len(data) // self.stride, self.stride - 1
+        if self.cols == 0 or self.rows * self.stride != len(data) or data.count(b"\n") != self.rows:
+            raise ValueError("Manifold rows must be non-empty and of equal length")
+
+    @classmethod
+    def from_file(cls, filename="resources.txt"):
+        with open(filename, "rb") as f:
+            return cls(f.read())
+
+    @classmethod
+    def from_grid(cls, grid):
+        return cls("\n".join("".join(row) for row in grid).encode())
+
+    @cached_property
+    def buffer(self):
+        # Zero-copy view of the raw bytes, newlines included
+        return np.frombuffer(self.data, dtype=np.uint8).reshape(self.rows, self.stride)
+
+    @cached_property
+    def cells(self):
+        return self.buffer[:, : self.cols]
+
+    @cached_property
+    def grid(self):
+        return [list(line) for line in self.data.decode().splitlines()]
+
+    @cached_property
+    def splitter_density(self):
+        return np.count_nonzero(self.cells == ord("^")) / self.cells.size
+
+
+def load_library(path=LIBRARY_PATH):
+    """
+    Load the C kernel built by `make lib` in the C directory.
+
+    Returns:
+        ctypes.CDLL | None: The library, or None when it has not been built.
+    """
+    if not os.path.isfile(path):
+        return None
+    lib = ctypes.CDLL(path)
+    lib.count_timelines_buffer.argtypes = [
+        ctypes.c_void_p,
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_long,
+        ctypes.POINTER(ctypes.c_ulonglong),
+    ]
+    lib.count_timelines_buffer.restype = ctypes.c_int
+    return lib
+
+
+_library = load_library()
+
+
+@register_backend("lru")
+def count_with_lru(manifold):
+    return count_timelines_lru(manifold.grid)
+
+
+@register_backend("dp")
+def count_with_dp(manifold):
+    return count_timelines_dp(manifold.grid)
+
+
+@register_backend("sparse")
+def count_with_sparse(manifold):
+    return count_timelines_super_fast(manifold.grid)
+
+
+@register_backend("numpy")
+def count_with_numpy(manifold):
+    return count_timelines_cells(manifold.cells)
+
+
+@register_backend("c")
+def count_with_c(manifold):
+    if _library is None:
+        raise RuntimeError(f"C library not found at {LIBRARY_PATH}, run `make lib` in the C directory")
+
+    total = ctypes.c_ulonglong()
+    status = _library.count_timelines_buffer(
+        manifold.buffer.ctypes.data, manifold.rows, manifold.cols, manifold.stride, ctypes.byref(total)
+    )
+    if status == 1:
+        # Beyond 64 bits: the NumPy backend switches to Python integers
+        return count_with_numpy(manifold)
+    if status == -1:
+        raise ValueError("Start 'S' not found")
+    if status != 0:
+        raise MemoryError("C kernel could not allocate its row buffers")
+    return total.value
+
+
+def choose_backend(manifold):
+    # The C kernel beats both Python backends at every size once built
+    if _library is not None:
+        return "c"
+    if manifold.rows * manifold.cols < SMALL_GRID or manifold.splitter_density < SPARSE_DENSITY:
+        return "sparse"
+    return "numpy"
+
+
+def count_timelines(grid, backend="auto"):
+    """
+    Count the timelines of a manifold with one of the registered backends.
+
+    All backends agree on manifolds whose splitters stay off the outer
+    columns and the last row, like the puzzle input. On the edges, "lru"
+    also counts timelines leaving through the sides and "dp" counts arrivals
+    on the last row rather than exits below it.
+
+    Args:
+        grid (Manifold | list[list[str]] | bytes): The manifold, a 2D grid
+            or the raw contents of the input file.
+        backend (str): A name from BACKENDS, or "auto" to pick one from the
+            grid size and splitter density.
+
+    Returns:
+        int: Total number of timelines.
+
+    Raises:
+        ValueError: If the backend is unknown.
+    """
+    if not isinstance(grid, Manifold):
+        grid = Manifold(grid) if isinstance(grid, (bytes, bytearray, memoryview)) else Manifold.from_grid(grid)
+    if backend == "auto":
+        backend = choose_backend(grid)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {sorted(BACKENDS)} or 'auto'")
+    return BACKENDS[backend](grid)
+
+
+if __name__ == "__main__":
+    resources_file = os.path.join(os.path.dirname(__file__), "..", "resources.txt")
+    manifold = Manifold.from_file(resources_file)
+    backend = choose_backend(manifold)
+    print(f"Total timelines ({backend}):", count_timelines(manifold, backend))
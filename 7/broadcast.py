@@ -0,0 +1,193 @@
+import os
+import threading
+
+DEFAULT_FPS = 20
+MAX_FPS = 120
+# Frames cached per simulation; past this the grid is still updated but not logged
+MAX_FRAMES = 100_000
+
+
+def encode_cells(cells):
+    """Encode a {(row, column): character} delta as 'r,c,ch;r,c,ch' for a CELLS: event."""
+    return ";".join(f"{r},{c},{ch}" for (r, c), ch in cells.items())
+
+
+class FrameLog:
+    """
+    A simulation run once in a background thread and shared by every viewer.
+
+    The producer yields frames that are either a list of changed cells
+    (row, column, character) or a status string. Frames are cached in the
+    log and applied to a copy of the grid, so any number of viewers can
+    replay them, or join late and pick up from the current grid.
+
+    The producer is paused while nobody is subscribed, and closed when the
+    log is stopped. Past MAX_FRAMES cached frames it keeps running but only
+    updates the grid: when it finishes, the log gets one frame with every
+    cell changed since the cap, then the status strings held back meanwhile.
+    Viewers always receive a final END event, on which clients close.
+    """
+
+    def __init__(self, grid, producer):
+        self.initial = "<br>".join("".join(row) for row in grid)
+        self.state = [list(row) for row in grid]
+        self.frames = []  # Cell lists and status strings, in order
+        self.capped = None  # Grid when MAX_FRAMES was reached
+        self.held = []  # Status strings produced past the cap
+        self.done = False
+        self.stopped = False
+        self.subscribers = 0
+        self.cond = threading.Condition()
+        thread = threading.Thread(target=self._run, args=(producer,), daemon=True)
+        thread.start()
+
+    def _run(self, producer):
+        try:
+            for frame in producer:
+                with self.cond:
+                    while self.subscribers == 0 and not self.stopped:
+                        self.cond.wait()
+                    if self.stopped:
+                        break
+                    if self.capped is None and len(self.frames) >= MAX_FRAMES:
+                        self.capped = [row[:] for row in self.state]
+                    if self.capped is not None:
+                        if isinstance(frame, str):
+                            self.held.append(frame)
+                        else:
+                            for r, c, ch in frame:
+                                self.state[r][c] = ch
+                        continue
+                    if not isinstance(frame, str):
+                        for r, c, ch in frame:
+                            self.state[r][c] = ch
+                    self.frames.append(frame)
+                    self.cond.notify_all()
+        finally:
+            producer.close()
+            with self.cond:
+                if self.capped is not None:
+                    # Catch replaying viewers up to the final grid in one frame
+                    delta = [
+                        (r, c, ch)
+                        for r, row in enumerate(self.state)
+                        for c, ch in enumerate(row)
+                        if self.capped[r][c] != ch
+                    ]
+                    if delta:
+                        self.frames.append(delta)
+                    self.frames.extend(self.held)
+                self.done = True
+                self.cond.notify_all()
+
+    def stop(self):
+        """Stop the producer; viewers still receive the frames already cached."""
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+
+    def subscribe(self, fps=DEFAULT_FPS, live=False):
+        """
+        Yield SSE messages for one viewer at its negotiated frame rate.
+
+        By default the viewer replays the cached frames from the start, one
+        per tick. A live viewer starts from the current grid instead and gets,
+        at every tick, all the frames produced since the previous one merged
+        into a single CELLS event, so it never falls behind the producer.
+        """
+        interval = 1.0 / max(1.0, min(float(fps), MAX_FPS))
+        with self.cond:
+            self.subscribers += 1
+            self.cond.notify_all()
+        try:
+            with self.cond:
+                if live:
+                    position = len(self.frames)
+                    snapshot = "<br>".join("".join(row) for row in self.state)
+                    statuses = [f for f in self.frames if isinstance(f, str)]
+                else:
+                    position, snapshot, statuses = 0, self.initial, []
+            yield f"data: INIT:{snapshot}\n\n"
+            for status in statuses:
+                yield f"data: {status}\n\n"
+
+            while True:
+                with self.cond:
+                    while position == len(self.frames) and not self.done:
+                        self.cond.wait()
+                    end = len(self.frames) if live else position + 1
+                    batch = self.frames[position:end]
+                if not batch:
+                    # Simulation finished and every frame was sent; without a
+                    # terminal event EventSource would reconnect and replay
+                    yield "data: END\n\n"
+                    return
+                position += len(batch)
+
+                cells = {}
+                for frame in batch:
+                    if isinstance(frame, str):
+                        if cells:
+                            yield f"data: CELLS:{encode_cells(cells)}\n\n"
+                            cells = {}
+                        yield f"data: {frame}\n\n"
+                    else:
+                        for r, c, ch in frame:
+                            cells[r, c] = ch  # Later changes to a cell win
+                if cells:
+                    yield f"data: CELLS:{encode_cells(cells)}\n\n"
+                # Pace this viewer only; the simulation never waits. A streaming
+                # WSGI response holds its worker thread for its whole lifetime,
+                # so waiting here costs no extra thread, and stop() cuts it short
+                with self.cond:
+                    self.cond.wait_for(lambda: self.stopped, timeout=interval)
+        finally:
+            with self.cond:
+                self.subscribers -= 1
+
+
+_logs = {}
+_logs_lock = threading.Lock()
+
+
+def shared_log(filename, load_grid, producer_factory):
+    """
+    Return the FrameLog for an input file, starting its simulation on first use.
+
+    Logs are keyed by path and modification time, so editing the input starts
+    a fresh simulation while unchanged inputs are simulated only once. The
+    log of an earlier version of the file is stopped and dropped.
+    """
+    key = (os.path.abspath(filename), os.path.getmtime(filename))
+    with _logs_lock:
+        if key not in _logs:
+            for old in [k for k in _logs if k[0] == key[0]]:
+                _logs.pop(old).stop()
+            grid = load_grid(filename)
+            _logs[key] = FrameLog(grid, producer_factory([list(row) for row in grid]))
+        return _logs[key]
+
+
+CLIENT_SCRIPT = """
+  // Apply INIT (full grid) and CELLS (changed cells) events to the grid lines
+  function parseGrid(text) {
+    return text.split("<br>").map(function(line) { return line.split(""); });
+  }
+  function applyCells(lines, payload) {
+    payload.split(";").forEach(function(cell) {
+      var parts = cell.split(",");
+      lines[parseInt(parts[0])][parseInt(parts[1])] = parts.slice(2).join(",");
+    });
+  }
+  function renderGrid(lines) {
+    return lines.map(function(line) { return line.join(""); }).join("<br>");
+  }
+  // Frame rate and mode are negotiated through the page URL, e.g. /?fps=60&live=1
+  var params = new URLSearchParams(window.location.search);
+  var streamUrl = "/stream?fps=" + (params.get("fps") || "%d") + "&live=" + (params.get("live") || "%d");
+"""
+
+
+def client_script(live=False):
+    """Client-side helpers, with the default frame rate and mode filled in."""
+    return CLIENT_SCRIPT % (DEFAULT_FPS, int(live))